@@ -531,6 +531,17 @@ async def deploy_application(provision_id: str):
                             400,
                         )
 
+                    # Run the service in the provision's own subnet and security
+                    # group when configure_networking recorded them
+                    network_ids = dict(
+                        db.query(ResourceModel.resource_type, ResourceModel.external_id)
+                        .filter(
+                            ResourceModel.provision_id == provision_id,
+                            ResourceModel.resource_type.in_(("subnet", "security_group")),
+                        )
+                        .all()
+                    )
+
                     # Deploy to ECS in LocalStack
                     deployment = await localstack_adapter.deploy_to_ecs(
                         image_url=container_image,
@@ -539,6 +550,8 @@ async def deploy_application(provision_id: str):
                         provision_id=provision_id,
                         db_session=db,
                         environment_vars=environment_vars,
+                        subnet_id=network_ids.get("subnet"),
+                        security_group_id=network_ids.get("security_group"),
                     )
                     endpoint = deployment.endpoint
                     message = f"Application deployed to ECS. Endpoint: {endpoint}"
@@ -148,20 +148,13 @@ def ask_question(config_id: str):
 
             # Store question and answer in conversation history
             if session_id:
-                qa_context.add_message(
+                qa_context.add_messages(
                     db_session=db,
                     session_id=session_id,
-                    role="user",
-                    content=question,
-                    configuration_id=config_id,
-                )
-
-                qa_context.add_message(
-                    db_session=db,
-                    session_id=session_id,
-                    role="assistant",
-                    content=answer,
-                    configuration_id=config_id,
+                    messages=[
+                        ("user", question, config_id),
+                        ("assistant", answer, config_id),
+                    ],
                 )
 
             logger.info(f"Q&A question processed successfully for configuration: {config_id}")
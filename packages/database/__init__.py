@@ -5,7 +5,7 @@ for the Hybrid Cloud Controller application.
 """
 
 import os
-from typing import Optional
+from typing import Any, Optional
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
@@ -17,19 +17,21 @@ _engine: Optional[object] = None
 _session_factory: Optional[sessionmaker] = None
 
 
-def init_database(database_url: Optional[str] = None) -> None:
+def init_database(database_url: Optional[str] = None, **engine_options: Any) -> None:
     """Initialize the database engine and session factory.
 
     Args:
         database_url: Database connection URL. If None, reads from DATABASE_URL
                      environment variable or defaults to SQLite.
+        **engine_options: Extra keyword arguments passed to create_engine
+                          (e.g. poolclass, connect_args).
     """
     global _engine, _session_factory
 
     if database_url is None:
         database_url = os.getenv("DATABASE_URL", "sqlite:///hybrid_cloud_controller.db")
 
-    _engine = create_engine(database_url, echo=False)
+    _engine = create_engine(database_url, echo=False, **engine_options)
     _session_factory = sessionmaker(bind=_engine)
 
 
@@ -6,6 +6,7 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     LargeBinary,
     String,
@@ -184,6 +185,11 @@ class MetricsModel(Base):
     """Resource metrics model for monitoring."""
 
     __tablename__ = "metrics"
+    __table_args__ = (
+        # Serves latest-metric and time-range lookups per resource; SQLite
+        # walks it backwards for ORDER BY timestamp DESC
+        Index("ix_metrics_resource_timestamp", "resource_id", "timestamp"),
+    )
 
     id = Column(String(36), primary_key=True)
     resource_id = Column(String(36), ForeignKey("resources.id"), nullable=False)
@@ -203,6 +209,10 @@ class ConversationModel(Base):
     """Conversation message model for Q&A service."""
 
     __tablename__ = "conversations"
+    __table_args__ = (
+        # Serves get_history's filter + ORDER BY without a separate sort
+        Index("ix_conversations_session_timestamp", "session_id", "timestamp"),
+    )
 
     id = Column(String(36), primary_key=True)
     session_id = Column(String(36), ForeignKey("sessions.id"), nullable=False)
@@ -6,18 +6,24 @@ including EC2 instances, EBS volumes, VPC networking, and ECS deployments.
 
 from __future__ import annotations
 
+import asyncio
+import logging
 import os
 import uuid
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from typing import Optional
 
 import boto3
+from botocore.config import Config
 from sqlalchemy.orm import Session
 
 from packages.database import models
 
+logger = logging.getLogger(__name__)
+
 
 class ResourceStatus(Enum):
     """Status of provisioned resources."""
@@ -111,6 +117,9 @@ class NetworkSpec:
 def _get_boto3_client(service_name: str, endpoint_url: Optional[str] = None):
     """Create boto3 client configured for LocalStack.
 
+    Clients are cached per (service, endpoint) because building one is expensive
+    and boto3 clients are thread-safe.
+
     Args:
         service_name: AWS service name (ec2, ecs, etc.)
         endpoint_url: LocalStack endpoint URL (defaults to LOCALSTACK_ENDPOINT env var)
@@ -121,18 +130,50 @@ def _get_boto3_client(service_name: str, endpoint_url: Optional[str] = None):
     if endpoint_url is None:
         endpoint_url = os.getenv("LOCALSTACK_ENDPOINT", "http://localhost:4566")
 
+    return _build_boto3_client(service_name, endpoint_url)
+
+
+def _client_config() -> Config:
+    """Return the botocore config for adapter clients.
+
+    A larger keep-alive connection pool for the multi-call provisioning paths,
+    and standard-mode retries for LocalStack's transient errors. A new Config
+    is built per client because botocore rewrites the retries dict in place.
+    """
+    return Config(
+        max_pool_connections=50,
+        tcp_keepalive=True,
+        retries={"mode": "standard", "max_attempts": 3},
+    )
+
+
+# Subnet used for ECS services when no provisioned subnet is given; LocalStack
+# does not validate it
+_PLACEHOLDER_SUBNET_ID = "subnet-12345"
+
+# Upper bound on create_volume calls in flight for one create_ebs_volume call
+MAX_CONCURRENT_VOLUME_CALLS = 8
+
+
+@lru_cache(maxsize=16)
+def _build_boto3_client(service_name: str, endpoint_url: str):
+    """Build the boto3 client behind _get_boto3_client, once per (service, endpoint)."""
     return boto3.client(
         service_name,
         endpoint_url=endpoint_url,
         region_name="us-east-1",
         aws_access_key_id="test",
         aws_secret_access_key="test",
+        config=_client_config(),
     )
 
 
+@lru_cache(maxsize=64)
 def _select_instance_type(cpu_cores: int, memory_gb: int) -> str:
     """Select appropriate EC2 instance type based on CPU and memory requirements.
 
+    Results are memoized; provisioning requests repeat a small set of sizes.
+
     Args:
         cpu_cores: Number of CPU cores required
         memory_gb: Memory in GB required
@@ -155,9 +196,12 @@ def _select_instance_type(cpu_cores: int, memory_gb: int) -> str:
         return "m5.8xlarge"
 
 
+@lru_cache(maxsize=64)
 def _select_volume_type(storage_type: str, iops: int | None) -> str:
     """Select appropriate EBS volume type.
 
+    Results are memoized like _select_instance_type.
+
     Args:
         storage_type: Storage type from configuration (ssd, hdd, nvme)
         iops: IOPS requirement if specified
@@ -173,6 +217,15 @@ def _select_volume_type(storage_type: str, iops: int | None) -> str:
         return "st1"
 
 
+def _insert_resources(db_session: Session, rows: list[dict]) -> None:
+    """Insert resource rows with one executemany INSERT, skipping the unit of work.
+
+    Used by the paths that record one row per instance or volume.
+    """
+    if rows:
+        db_session.execute(models.ResourceModel.__table__.insert(), rows)
+
+
 async def create_ec2_instance(
     spec: ComputeSpec,
     provision_id: str,
@@ -197,12 +250,16 @@ async def create_ec2_instance(
 
     # Create instances
     instances = []
+    resource_rows = []
     try:
+        # The client retries failed calls; the idempotency token keeps a retry
+        # after a timed-out but accepted request from launching a second batch
         response = ec2_client.run_instances(
             ImageId="ami-0c55b159cbfafe1f0",  # Placeholder AMI for LocalStack
             InstanceType=instance_type,
             MinCount=spec.instance_count,
             MaxCount=spec.instance_count,
+            ClientToken=f"hybrid-cloud-{provision_id}",
             TagSpecifications=[
                 {
                     "ResourceType": "instance",
@@ -226,17 +283,19 @@ async def create_ec2_instance(
             instances.append(instance)
 
             # Record resource in database
-            resource_record = models.ResourceModel(
-                id=str(uuid.uuid4()),
-                provision_id=provision_id,
-                resource_type="ec2_instance",
-                external_id=instance.instance_id,
-                status=instance.state,
-                connection_info_json=f'{{"instance_type": "{instance_type}", "public_ip": "{instance.public_ip}", "private_ip": "{instance.private_ip}"}}',
-                created_at=datetime.utcnow(),
+            resource_rows.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "provision_id": provision_id,
+                    "resource_type": "ec2_instance",
+                    "external_id": instance.instance_id,
+                    "status": instance.state,
+                    "connection_info_json": f'{{"instance_type": "{instance_type}", "public_ip": "{instance.public_ip}", "private_ip": "{instance.private_ip}"}}',
+                    "created_at": datetime.utcnow(),
+                }
             )
-            db_session.add(resource_record)
 
+        _insert_resources(db_session, resource_rows)
         db_session.commit()
         return instances
 
@@ -245,6 +304,20 @@ async def create_ec2_instance(
         raise RuntimeError(f"Failed to create EC2 instances: {e}") from e
 
 
+def _delete_orphaned_volume(ec2_client, volume_id: str) -> bool:
+    """Best-effort delete of a volume created by a partially failed batch.
+
+    Returns:
+        True if the volume was deleted, False if it was left behind
+    """
+    try:
+        ec2_client.delete_volume(VolumeId=volume_id)
+    except Exception:
+        logger.warning("Failed to delete orphaned volume %s", volume_id, exc_info=True)
+        return False
+    return True
+
+
 async def create_ebs_volume(
     spec: StorageSpec,
     instance_count: int,
@@ -254,6 +327,11 @@ async def create_ebs_volume(
 ) -> list[EBSVolume]:
     """Create EBS volumes in LocalStack matching storage specifications.
 
+    Volumes are created concurrently, at most MAX_CONCURRENT_VOLUME_CALLS at a
+    time. If any call fails, the volumes that were created are deleted before
+    the error is raised; volumes that cannot be deleted are logged and listed
+    in a note on the underlying error.
+
     Args:
         spec: Storage specifications (type, capacity, IOPS)
         instance_count: Number of volumes to create (one per instance)
@@ -271,7 +349,9 @@ async def create_ebs_volume(
 
     # Create volumes
     volumes = []
+    resource_rows = []
     try:
+        volume_params_list = []
         for i in range(instance_count):
             # Prepare volume parameters
             volume_params = {
@@ -293,8 +373,35 @@ async def create_ebs_volume(
             if spec.iops and volume_type in ["io1", "io2", "gp3"]:
                 volume_params["Iops"] = spec.iops
 
-            response = ec2_client.create_volume(**volume_params)
+            volume_params_list.append(volume_params)
+
+        # The volumes are independent, so issue the blocking calls concurrently
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_VOLUME_CALLS)
+
+        async def _create_volume(volume_params):
+            async with semaphore:
+                return await asyncio.to_thread(ec2_client.create_volume, **volume_params)
 
+        responses = await asyncio.gather(
+            *(_create_volume(volume_params) for volume_params in volume_params_list),
+            return_exceptions=True,
+        )
+
+        # Every call has finished; delete the volumes that were created if any failed,
+        # since no resource row will track them
+        errors = [response for response in responses if isinstance(response, BaseException)]
+        if errors:
+            leaked = [
+                response["VolumeId"]
+                for response in responses
+                if not isinstance(response, BaseException)
+                and not _delete_orphaned_volume(ec2_client, response["VolumeId"])
+            ]
+            if leaked:
+                errors[0].add_note(f"Orphaned volumes could not be deleted: {', '.join(leaked)}")
+            raise errors[0]
+
+        for response in responses:
             volume = EBSVolume(
                 volume_id=response["VolumeId"],
                 size_gb=spec.capacity_gb,
@@ -305,17 +412,19 @@ async def create_ebs_volume(
             volumes.append(volume)
 
             # Record resource in database
-            resource_record = models.ResourceModel(
-                id=str(uuid.uuid4()),
-                provision_id=provision_id,
-                resource_type="ebs_volume",
-                external_id=volume.volume_id,
-                status=volume.state,
-                connection_info_json=f'{{"size_gb": {spec.capacity_gb}, "volume_type": "{volume_type}", "iops": {spec.iops}}}',
-                created_at=datetime.utcnow(),
+            resource_rows.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "provision_id": provision_id,
+                    "resource_type": "ebs_volume",
+                    "external_id": volume.volume_id,
+                    "status": volume.state,
+                    "connection_info_json": f'{{"size_gb": {spec.capacity_gb}, "volume_type": "{volume_type}", "iops": {spec.iops}}}',
+                    "created_at": datetime.utcnow(),
+                }
             )
-            db_session.add(resource_record)
 
+        _insert_resources(db_session, resource_rows)
         db_session.commit()
         return volumes
 
@@ -435,7 +544,6 @@ async def configure_networking(
             connection_info_json=f'{{"cidr_block": "10.0.0.0/16", "subnet_id": "{subnet_id}", "security_group_id": "{security_group_id}"}}',
             created_at=datetime.utcnow(),
         )
-        db_session.add(vpc_record)
 
         # Record subnet resource in database
         subnet_record = models.ResourceModel(
@@ -447,7 +555,6 @@ async def configure_networking(
             connection_info_json=f'{{"cidr_block": "10.0.1.0/24", "vpc_id": "{vpc_id}"}}',
             created_at=datetime.utcnow(),
         )
-        db_session.add(subnet_record)
 
         # Record security group resource in database
         sg_record = models.ResourceModel(
@@ -459,8 +566,8 @@ async def configure_networking(
             connection_info_json=f'{{"vpc_id": "{vpc_id}"}}',
             created_at=datetime.utcnow(),
         )
-        db_session.add(sg_record)
 
+        db_session.add_all([vpc_record, subnet_record, sg_record])
         db_session.commit()
         return network_config
 
@@ -477,6 +584,8 @@ async def deploy_to_ecs(
     db_session: Session,
     environment_vars: dict[str, str] | None = None,
     endpoint_url: str | None = None,
+    subnet_id: str | None = None,
+    security_group_id: str | None = None,
 ) -> ECSDeployment:
     """Deploy container to emulated ECS in LocalStack.
 
@@ -488,6 +597,10 @@ async def deploy_to_ecs(
         db_session: Database session for recording resources
         environment_vars: Optional environment variables for the container
         endpoint_url: LocalStack endpoint URL
+        subnet_id: Subnet for the service's tasks, e.g. NetworkConfig.subnet_id from
+                   configure_networking (defaults to a placeholder LocalStack accepts)
+        security_group_id: Security group for the service's tasks, e.g.
+                           NetworkConfig.security_group_id (defaults to none)
 
     Returns:
         ECSDeployment with cluster, service, and task definition details
@@ -553,7 +666,8 @@ async def deploy_to_ecs(
             launchType="FARGATE",
             networkConfiguration={
                 "awsvpcConfiguration": {
-                    "subnets": ["subnet-12345"],  # Placeholder for LocalStack
+                    "subnets": [subnet_id or _PLACEHOLDER_SUBNET_ID],
+                    "securityGroups": [security_group_id] if security_group_id else [],
                     "assignPublicIp": "ENABLED",
                 }
             },
@@ -581,7 +695,6 @@ async def deploy_to_ecs(
             connection_info_json=f'{{"cluster_arn": "{cluster_arn}"}}',
             created_at=datetime.utcnow(),
         )
-        db_session.add(cluster_record)
 
         # Record ECS service in database
         service_record = models.ResourceModel(
@@ -593,8 +706,8 @@ async def deploy_to_ecs(
             connection_info_json=f'{{"service_arn": "{service_arn}", "task_definition_arn": "{task_definition_arn}", "endpoint": "http://localhost:8080"}}',
             created_at=datetime.utcnow(),
         )
-        db_session.add(service_record)
 
+        db_session.add_all([cluster_record, service_record])
         db_session.commit()
         return deployment
 
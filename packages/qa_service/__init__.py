@@ -6,6 +6,7 @@ their TCO analysis results, compare costs, and get recommendations.
 
 from packages.qa_service.context import (
     add_message,
+    add_messages,
     clear_history,
     get_history,
 )
@@ -22,6 +23,7 @@ __all__ = [
     "compare_aspects",
     "generate_recommendation",
     "add_message",
+    "add_messages",
     "get_history",
     "clear_history",
 ]
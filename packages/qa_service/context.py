@@ -4,13 +4,95 @@ This module manages conversation history for Q&A sessions, storing messages
 with role (user/assistant) and timestamp in the database.
 """
 
-from datetime import datetime
+from collections.abc import Iterable
+from datetime import datetime, timedelta
 from uuid import uuid4
 
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
 from packages.database.models import ConversationModel
 
+# Roles accepted for conversation messages
+_VALID_ROLES: frozenset[str] = frozenset({"user", "assistant"})
+
+
+def _to_message(msg_id: str, role: str, content: str, timestamp: datetime) -> dict[str, str]:
+    """Convert stored message columns into the history dict format."""
+    return {
+        "id": msg_id,
+        "role": role,
+        "content": content,
+        "timestamp": timestamp.isoformat(),
+    }
+
+
+def _build_row(
+    session_id: str,
+    role: str,
+    content: str,
+    configuration_id: str,
+    timestamp: datetime,
+) -> dict[str, object]:
+    """Build a conversations row for a single message.
+
+    Args:
+        session_id: The session identifier for the conversation
+        role: The role of the message sender (user or assistant)
+        content: The message content
+        configuration_id: The configuration ID associated with the conversation
+        timestamp: When the message was recorded
+
+    Returns:
+        Column values ready to be passed to an INSERT
+
+    Raises:
+        ValueError: If role is not 'user' or 'assistant'
+    """
+    if role not in _VALID_ROLES:
+        raise ValueError(f"Invalid role: {role}. Must be 'user' or 'assistant'")
+
+    return {
+        "id": str(uuid4()),
+        "session_id": session_id,
+        "configuration_id": configuration_id,
+        "role": role,
+        "content": content,
+        "timestamp": timestamp,
+    }
+
+
+def add_messages(
+    db_session: Session,
+    session_id: str,
+    messages: Iterable[tuple[str, str, str]],
+) -> None:
+    """Add several messages to conversation history in one INSERT.
+
+    All rows are validated before anything is written, then inserted with a
+    single executemany statement and committed once. The clock is read once;
+    each message is stamped one microsecond after the previous one so the
+    batch keeps its order when sorted by timestamp.
+
+    Args:
+        db_session: Database session
+        session_id: The session identifier for the conversation
+        messages: (role, content, configuration_id) tuples in chronological order
+
+    Raises:
+        ValueError: If any role is not 'user' or 'assistant'
+    """
+    now = datetime.utcnow()
+    rows = [
+        _build_row(session_id, role, content, configuration_id, now + timedelta(microseconds=i))
+        for i, (role, content, configuration_id) in enumerate(messages)
+    ]
+    if not rows:
+        return
+
+    db_session.execute(ConversationModel.__table__.insert(), rows)
+    db_session.commit()
+
 
 def add_message(
     db_session: Session,
@@ -32,19 +114,7 @@ def add_message(
     Raises:
         ValueError: If role is not 'user' or 'assistant'
     """
-    if role not in ("user", "assistant"):
-        raise ValueError(f"Invalid role: {role}. Must be 'user' or 'assistant'")
-
-    message = ConversationModel(
-        id=str(uuid4()),
-        session_id=session_id,
-        configuration_id=configuration_id,
-        role=role,
-        content=content,
-        timestamp=datetime.utcnow(),
-    )
-    db_session.add(message)
-    db_session.commit()
+    add_messages(db_session, session_id, [(role, content, configuration_id)])
 
 
 def get_history(db_session: Session, session_id: str) -> list[dict[str, str]]:
@@ -61,22 +131,17 @@ def get_history(db_session: Session, session_id: str) -> list[dict[str, str]]:
         - content: Message content
         - timestamp: ISO format timestamp
     """
-    messages = (
-        db_session.query(ConversationModel)
-        .filter(ConversationModel.session_id == session_id)
+    rows = db_session.execute(
+        select(
+            ConversationModel.id,
+            ConversationModel.role,
+            ConversationModel.content,
+            ConversationModel.timestamp,
+        )
+        .where(ConversationModel.session_id == session_id)
         .order_by(ConversationModel.timestamp)
-        .all()
-    )
-
-    return [
-        {
-            "id": msg.id,
-            "role": msg.role,
-            "content": msg.content,
-            "timestamp": msg.timestamp.isoformat(),
-        }
-        for msg in messages
-    ]
+    ).all()
+    return [_to_message(*row) for row in rows]
 
 
 def clear_history(db_session: Session, session_id: str) -> None:
@@ -86,5 +151,5 @@ def clear_history(db_session: Session, session_id: str) -> None:
         db_session: Database session
         session_id: The session identifier for the conversation
     """
-    db_session.query(ConversationModel).filter(ConversationModel.session_id == session_id).delete()
+    db_session.execute(delete(ConversationModel).where(ConversationModel.session_id == session_id))
     db_session.commit()
@@ -1,25 +1,47 @@
-"""Credential encryption service using AES-256."""
+"""Credential encryption service using AES-256-GCM.
+
+Credentials written before the switch to GCM were encrypted with AES-256-CBC
+and PKCS7 padding under a 16-byte IV. decrypt_credential still reads them;
+callers can use is_legacy() to re-encrypt such rows with encrypt_credential.
+"""
 
 import os
 from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
 
-from cryptography.hazmat.backends import default_backend
+from cryptography.exceptions import InvalidTag
 from cryptography.hazmat.primitives import padding
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+# GCM nonce size recommended by NIST SP 800-38D
+NONCE_SIZE = 12
+
+# IV size of credentials encrypted with the earlier AES-256-CBC scheme
+LEGACY_IV_SIZE = 16
 
 
-@dataclass
+@dataclass(slots=True)
 class EncryptedData:
-    """Container for encrypted data and initialization vector."""
+    """Container for encrypted data and initialization vector.
+
+    encrypted_value holds the GCM ciphertext with its 16-byte authentication
+    tag appended; iv holds the 12-byte nonce.
+    """
 
     encrypted_value: bytes
     iv: bytes
 
 
+@lru_cache(maxsize=1)
 def get_encryption_key() -> bytes:
     """
     Retrieve encryption key from environment variables.
 
+    The decoded key is cached after the first successful call; call
+    get_encryption_key.cache_clear() after changing ENCRYPTION_KEY.
+
     Returns:
         32-byte encryption key for AES-256
 
@@ -46,15 +68,31 @@ def get_encryption_key() -> bytes:
     return key
 
 
-def encrypt_credential(plaintext: str) -> EncryptedData:
+@lru_cache(maxsize=4)
+def _get_cipher(key: bytes) -> AESGCM:
+    """Return an AESGCM instance for key, reused across calls with the same key."""
+    return AESGCM(key)
+
+
+def _resolve_key(key: Optional[bytes]) -> bytes:
+    """Return key if given, otherwise the key configured in the environment."""
+    if key is None:
+        return get_encryption_key()
+    if len(key) != 32:
+        raise ValueError(f"Encryption key must be 32 bytes for AES-256, got {len(key)} bytes")
+    return key
+
+
+def encrypt_credential(plaintext: str, key: Optional[bytes] = None) -> EncryptedData:
     """
-    Encrypt a credential using AES-256-CBC.
+    Encrypt a credential using AES-256-GCM.
 
     Args:
         plaintext: The credential to encrypt
+        key: 32-byte encryption key (defaults to get_encryption_key())
 
     Returns:
-        EncryptedData containing encrypted value and initialization vector
+        EncryptedData containing encrypted value and nonce
 
     Raises:
         ValueError: If encryption key is invalid
@@ -62,29 +100,83 @@ def encrypt_credential(plaintext: str) -> EncryptedData:
     if not plaintext:
         raise ValueError("Cannot encrypt empty plaintext")
 
-    key = get_encryption_key()
-
-    # Generate random IV (16 bytes for AES)
-    iv = os.urandom(16)
+    key = _resolve_key(key)
 
-    # Pad plaintext to block size (128 bits = 16 bytes for AES)
-    padder = padding.PKCS7(128).padder()
-    padded_data = padder.update(plaintext.encode("utf-8")) + padder.finalize()
+    # Generate random nonce (never reused with the same key)
+    iv = os.urandom(NONCE_SIZE)
 
-    # Encrypt using AES-256-CBC
-    cipher = Cipher(algorithms.AES(key), modes.CBC(iv), backend=default_backend())
-    encryptor = cipher.encryptor()
-    encrypted_value = encryptor.update(padded_data) + encryptor.finalize()
+    # Encrypt and authenticate using AES-256-GCM
+    encrypted_value = _get_cipher(key).encrypt(iv, plaintext.encode("utf-8"), None)
 
     return EncryptedData(encrypted_value=encrypted_value, iv=iv)
 
 
-def decrypt_credential(encrypted_data: EncryptedData) -> str:
+def encrypt_credentials(plaintexts: list[str], key: Optional[bytes] = None) -> list[EncryptedData]:
+    """
+    Encrypt several credentials using AES-256-GCM.
+
+    Nonces for the whole batch come from a single os.urandom call and the
+    same cipher object is reused for every credential.
+
+    Args:
+        plaintexts: The credentials to encrypt
+        key: 32-byte encryption key (defaults to get_encryption_key())
+
+    Returns:
+        EncryptedData for each credential, in input order
+
+    Raises:
+        ValueError: If any plaintext is empty or the encryption key is invalid
+    """
+    if not all(plaintexts):
+        raise ValueError("Cannot encrypt empty plaintext")
+
+    cipher = _get_cipher(_resolve_key(key))
+    nonces = os.urandom(NONCE_SIZE * len(plaintexts))
+
+    results = []
+    for i, plaintext in enumerate(plaintexts):
+        iv = nonces[i * NONCE_SIZE : (i + 1) * NONCE_SIZE]
+        encrypted_value = cipher.encrypt(iv, plaintext.encode("utf-8"), None)
+        results.append(EncryptedData(encrypted_value=encrypted_value, iv=iv))
+
+    return results
+
+
+def is_legacy(encrypted_data: EncryptedData) -> bool:
+    """
+    Check whether encrypted data uses the legacy AES-256-CBC scheme.
+
+    Args:
+        encrypted_data: EncryptedData as stored
+
+    Returns:
+        True if the data carries a 16-byte CBC IV and should be re-encrypted
+    """
+    return len(encrypted_data.iv) == LEGACY_IV_SIZE
+
+
+def _decrypt_legacy_cbc(encrypted_data: EncryptedData, key: bytes) -> bytes:
+    """Decrypt AES-256-CBC + PKCS7 data written before the switch to GCM."""
+    decryptor = Cipher(algorithms.AES(key), modes.CBC(encrypted_data.iv)).decryptor()
+    try:
+        padded_plaintext = decryptor.update(encrypted_data.encrypted_value) + decryptor.finalize()
+        unpadder = padding.PKCS7(128).unpadder()
+        return unpadder.update(padded_plaintext) + unpadder.finalize()
+    except ValueError as e:
+        raise ValueError("Decryption failed: legacy CBC data is corrupt or key is wrong") from e
+
+
+def decrypt_credential(encrypted_data: EncryptedData, key: Optional[bytes] = None) -> str:
     """
-    Decrypt a credential using AES-256-CBC.
+    Decrypt a credential using AES-256-GCM.
+
+    Data with a 16-byte IV was written by the legacy AES-256-CBC scheme and
+    is decrypted with it instead.
 
     Args:
-        encrypted_data: EncryptedData containing encrypted value and IV
+        encrypted_data: EncryptedData containing encrypted value and nonce
+        key: 32-byte encryption key (defaults to get_encryption_key())
 
     Returns:
         Decrypted plaintext credential
@@ -96,18 +188,21 @@ def decrypt_credential(encrypted_data: EncryptedData) -> str:
         raise ValueError("Cannot decrypt empty encrypted value")
     if not encrypted_data.iv:
         raise ValueError("Cannot decrypt without initialization vector")
-    if len(encrypted_data.iv) != 16:
-        raise ValueError(f"IV must be 16 bytes, got {len(encrypted_data.iv)} bytes")
+    if len(encrypted_data.iv) not in (NONCE_SIZE, LEGACY_IV_SIZE):
+        raise ValueError(
+            f"IV must be {NONCE_SIZE} bytes ({LEGACY_IV_SIZE} for legacy CBC data), "
+            f"got {len(encrypted_data.iv)} bytes"
+        )
 
-    key = get_encryption_key()
+    key = _resolve_key(key)
 
-    # Decrypt using AES-256-CBC
-    cipher = Cipher(algorithms.AES(key), modes.CBC(encrypted_data.iv), backend=default_backend())
-    decryptor = cipher.decryptor()
-    padded_plaintext = decryptor.update(encrypted_data.encrypted_value) + decryptor.finalize()
+    if is_legacy(encrypted_data):
+        return _decrypt_legacy_cbc(encrypted_data, key).decode("utf-8")
 
-    # Unpad plaintext
-    unpadder = padding.PKCS7(128).unpadder()
-    plaintext = unpadder.update(padded_plaintext) + unpadder.finalize()
+    # Decrypt and verify the authentication tag
+    try:
+        plaintext = _get_cipher(key).decrypt(encrypted_data.iv, encrypted_data.encrypted_value, None)
+    except InvalidTag as e:
+        raise ValueError("Decryption failed: data was tampered with or key is wrong") from e
 
     return plaintext.decode("utf-8")
@@ -1,26 +1,142 @@
 """Shared test fixtures and configuration."""
 
+import os
+
+import bcrypt
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from hypothesis import settings
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
 
 from packages.database.models import Base
 
+try:
+    import psutil
+except ImportError:  # pragma: no cover - psutil is optional for the test run
+    psutil = None
 
-@pytest.fixture
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - uvloop is optional and not built for Windows
+    uvloop = None
+
+# Opt-in Hypothesis profiles: HYPOTHESIS_PROFILE=ci for a quick smoke pass,
+# dev for local runs. Without the variable Hypothesis keeps its defaults.
+settings.register_profile("ci", max_examples=5)
+settings.register_profile("dev", max_examples=50)
+if os.getenv("HYPOTHESIS_PROFILE"):
+    settings.load_profile(os.environ["HYPOTHESIS_PROFILE"])
+
+# Rough resident memory of one xdist worker, used to cap -n auto
+WORKER_MEMORY_GB = 0.5
+
+
+def pytest_xdist_auto_num_workers(config):
+    """Size -n auto to physical cores, capped by the memory currently available.
+
+    Returns None (xdist's own default) when psutil is not installed.
+    """
+    if psutil is None:
+        return None
+    physical = psutil.cpu_count(logical=False) or psutil.cpu_count() or 1
+    free_gb = psutil.virtual_memory().available / 1024**3
+    return max(1, min(physical, int(free_gb // WORKER_MEMORY_GB)))
+
+
+if uvloop is not None:
+
+    def pytest_asyncio_loop_factories(config, item):
+        """Run async tests on uvloop's event loop when it is installed."""
+        return {"uvloop": uvloop.new_event_loop}
+
+
+@pytest.fixture(scope="session")
 def db_engine():
-    """Create an in-memory SQLite database engine for testing."""
-    engine = create_engine("sqlite:///:memory:", echo=False)
+    """Create an in-memory SQLite database engine and schema once per test session.
+
+    Under pytest-xdist every worker is a separate process and gets its own
+    private in-memory database, so DB-backed tests need no cross-worker
+    coordination and each worker keeps its schema for the whole run.
+    """
+    engine = create_engine(
+        "sqlite:///:memory:",
+        echo=False,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    # Let SQLAlchemy own BEGIN so SAVEPOINTs behave under pysqlite
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     Base.metadata.create_all(engine)
     yield engine
-    Base.metadata.drop_all(engine)
     engine.dispose()
 
 
 @pytest.fixture
 def db_session(db_engine):
-    """Create a database session for testing."""
-    Session = sessionmaker(bind=db_engine)
-    session = Session()
+    """Create a database session whose work is rolled back after each test.
+
+    The session joins an outer connection-level transaction; commits made by
+    the code under test only release a SAVEPOINT, so nothing is ever written
+    through a real COMMIT.
+    """
+    connection = db_engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
     yield session
     session.close()
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture(scope="module")
+def module_connection(db_engine):
+    """Hold one connection and outer transaction open for the whole module.
+
+    Module-scoped fixtures flush shared rows through it; everything is rolled
+    back when the module finishes. Pair it with module_db_session.
+    """
+    connection = db_engine.connect()
+    transaction = connection.begin()
+    yield connection
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture
+def module_db_session(module_connection):
+    """Create a session whose work is rolled back after each test.
+
+    Each test runs inside a SAVEPOINT of the module transaction; commits made
+    by the code under test only release a nested SAVEPOINT, and rolling the
+    outer one back removes the test's rows while keeping module-level rows.
+    """
+    savepoint = module_connection.begin_nested()
+    session = Session(
+        bind=module_connection,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
+    yield session
+    session.close()
+    savepoint.rollback()
+
+
+@pytest.fixture(scope="session")
+def test_password():
+    """Plain text password shared by fixtures that seed user rows."""
+    return "testpassword123"
+
+
+@pytest.fixture(scope="session")
+def test_password_hash(test_password):
+    """Low-cost bcrypt hash of test_password, computed once per test session."""
+    return bcrypt.hashpw(test_password.encode("utf-8"), bcrypt.gensalt(rounds=4)).decode("utf-8")
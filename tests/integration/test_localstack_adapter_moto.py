@@ -0,0 +1,145 @@
+"""Integration tests for the LocalStack adapter against an in-process moto server.
+
+The unit tests in tests/unit/test_localstack_adapter.py mock boto3 entirely;
+these run the same adapter calls against moto so request shapes are validated
+by a real AWS API emulation. Skipped when moto is not installed.
+"""
+
+import urllib.request
+import uuid
+
+import boto3
+import pytest
+
+from packages.database.models import ResourceModel
+from packages.provisioner.localstack_adapter import (
+    ComputeSpec,
+    NetworkSpec,
+    _client_config,
+    configure_networking,
+    create_ec2_instance,
+    deploy_to_ecs,
+)
+
+moto_server = pytest.importorskip("moto.server")
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture(scope="session")
+def moto_endpoint():
+    """Start one threaded moto server per test process and return its URL.
+
+    Port 0 lets every xdist worker bind its own free port. The EC2 and ECS
+    service models are loaded here, so the first test does not pay botocore's
+    lazy JSON model loading.
+    """
+    server = moto_server.ThreadedMotoServer(ip_address="127.0.0.1", port=0)
+    server.start()
+    host, port = server.get_host_and_port()
+    url = f"http://{host}:{port}"
+    for service_name in ("ec2", "ecs"):
+        _client(service_name, url)
+    yield url
+    server.stop()
+
+
+@pytest.fixture
+def endpoint_url(moto_endpoint):
+    """Reset moto's in-memory AWS state before each test."""
+    request = urllib.request.Request(f"{moto_endpoint}/moto-api/reset", method="POST")
+    urllib.request.urlopen(request).close()
+    return moto_endpoint
+
+
+def _client(service_name, endpoint_url):
+    """Build a boto3 client for inspecting moto state, configured like the adapter's."""
+    return boto3.client(
+        service_name,
+        endpoint_url=endpoint_url,
+        region_name="us-east-1",
+        aws_access_key_id="test",
+        aws_secret_access_key="test",
+        config=_client_config(),
+    )
+
+
+def _recorded_types(db_session, provision_id):
+    """Return the sorted resource types recorded for a provision."""
+    rows = db_session.query(ResourceModel).filter_by(provision_id=provision_id).all()
+    return sorted(row.resource_type for row in rows)
+
+
+async def test_create_ec2_instance(endpoint_url, db_session):
+    """Test that instances are launched in moto and recorded in the database."""
+    provision_id = str(uuid.uuid4())
+    spec = ComputeSpec(cpu_cores=2, memory_gb=4, instance_count=2)
+
+    instances = await create_ec2_instance(spec, provision_id, db_session, endpoint_url)
+
+    reservations = _client("ec2", endpoint_url).describe_instances()["Reservations"]
+    launched = {item["InstanceId"] for r in reservations for item in r["Instances"]}
+    assert {instance.instance_id for instance in instances} == launched
+    assert {instance.instance_type for instance in instances} == {"t2.small"}
+    assert _recorded_types(db_session, provision_id) == ["ec2_instance", "ec2_instance"]
+
+
+async def test_configure_networking(endpoint_url, db_session):
+    """Test that the VPC, subnet and security group exist in moto and are linked."""
+    provision_id = str(uuid.uuid4())
+    spec = NetworkSpec(bandwidth_mbps=1000, monthly_data_transfer_gb=5000)
+
+    config = await configure_networking(spec, provision_id, db_session, endpoint_url)
+
+    ec2 = _client("ec2", endpoint_url)
+    subnet = ec2.describe_subnets(SubnetIds=[config.subnet_id])["Subnets"][0]
+    group = ec2.describe_security_groups(GroupIds=[config.security_group_id])
+    assert subnet["VpcId"] == config.vpc_id
+    assert group["SecurityGroups"][0]["VpcId"] == config.vpc_id
+    assert _recorded_types(db_session, provision_id) == ["security_group", "subnet", "vpc"]
+
+
+async def test_deploy_to_ecs(endpoint_url, db_session):
+    """Test that the service runs in the provisioned subnet with the converted CPU and memory."""
+    provision_id = str(uuid.uuid4())
+    network = await configure_networking(
+        NetworkSpec(bandwidth_mbps=1000, monthly_data_transfer_gb=5000),
+        provision_id,
+        db_session,
+        endpoint_url,
+    )
+
+    deployment = await deploy_to_ecs(
+        "nginx:latest",
+        2,
+        4,
+        provision_id,
+        db_session,
+        {"ENV": "production"},
+        endpoint_url,
+        subnet_id=network.subnet_id,
+        security_group_id=network.security_group_id,
+    )
+
+    ecs = _client("ecs", endpoint_url)
+    service = ecs.describe_services(
+        cluster=deployment.cluster_arn, services=[deployment.service_arn]
+    )["services"][0]
+    assert service["taskDefinition"] == deployment.task_definition_arn
+    awsvpc = service["networkConfiguration"]["awsvpcConfiguration"]
+    assert awsvpc["subnets"] == [network.subnet_id]
+    assert awsvpc["securityGroups"] == [network.security_group_id]
+    task_definition = ecs.describe_task_definition(
+        taskDefinition=deployment.task_definition_arn
+    )["taskDefinition"]
+    assert (task_definition["cpu"], task_definition["memory"]) == ("2048", "4096")
+    assert task_definition["containerDefinitions"][0]["environment"] == [
+        {"name": "ENV", "value": "production"}
+    ]
+    assert _recorded_types(db_session, provision_id) == [
+        "ecs_cluster",
+        "ecs_service",
+        "security_group",
+        "subnet",
+        "vpc",
+    ]
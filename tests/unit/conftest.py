@@ -0,0 +1,35 @@
+"""Shared fixtures for unit tests."""
+
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import insert
+
+from packages.database.models import UserModel
+
+
+@pytest.fixture
+def bulk_seed_users(test_password_hash):
+    """Return a helper that seeds many users with a single multi-row INSERT.
+
+    Each spec is a dict of UserModel columns; missing id, password_hash and
+    created_at values are filled in (the hash matches test_password).
+    """
+
+    def _seed(db, specs):
+        now = datetime.utcnow()
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "password_hash": test_password_hash,
+                "created_at": now,
+                **spec,
+            }
+            for spec in specs
+        ]
+        db.execute(insert(UserModel).values(rows))
+        db.commit()
+        return rows
+
+    return _seed
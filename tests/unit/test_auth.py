@@ -1,12 +1,38 @@
 """Unit tests for authentication service."""
 
+import secrets
+import uuid
 from datetime import datetime, timedelta
 
 import pytest
 
+from packages.database.models import SessionModel, UserModel
 from packages.security import auth
 
 
+@pytest.fixture
+def authed_session(db_session, test_password_hash):
+    """Insert a user and a valid session directly, skipping bcrypt work."""
+    now = datetime.utcnow()
+    user = UserModel(
+        id=str(uuid.uuid4()),
+        username="testuser",
+        password_hash=test_password_hash,
+        created_at=now,
+    )
+    session = SessionModel(
+        id=str(uuid.uuid4()),
+        user_id=user.id,
+        token=secrets.token_urlsafe(32),
+        created_at=now,
+        last_activity=now,
+        is_valid=True,
+    )
+    db_session.add_all([user, session])
+    db_session.commit()
+    return session
+
+
 class TestRegisterUser:
     """Tests for user registration."""
 
@@ -30,18 +56,21 @@ class TestRegisterUser:
 
         auth.register_user(db_session, username, password)
 
-        with pytest.raises(ValueError, match="already exists"):
+        with pytest.raises(ValueError) as exc_info:
             auth.register_user(db_session, username, "differentpassword")
+        assert "already exists" in str(exc_info.value)
 
     def test_register_user_empty_username(self, db_session):
         """Test that empty username is rejected."""
-        with pytest.raises(ValueError, match="required"):
+        with pytest.raises(ValueError) as exc_info:
             auth.register_user(db_session, "", "password123")
+        assert "required" in str(exc_info.value)
 
     def test_register_user_empty_password(self, db_session):
         """Test that empty password is rejected."""
-        with pytest.raises(ValueError, match="required"):
+        with pytest.raises(ValueError) as exc_info:
             auth.register_user(db_session, "testuser", "")
+        assert "required" in str(exc_info.value)
 
 
 class TestAuthenticate:
@@ -65,8 +94,9 @@ class TestAuthenticate:
 
     def test_authenticate_invalid_username(self, db_session):
         """Test authentication fails with invalid username."""
-        with pytest.raises(ValueError, match="Invalid credentials"):
+        with pytest.raises(ValueError) as exc_info:
             auth.authenticate(db_session, "nonexistent", "password123")
+        assert "Invalid credentials" in str(exc_info.value)
 
     def test_authenticate_invalid_password(self, db_session):
         """Test authentication fails with invalid password."""
@@ -75,28 +105,28 @@ class TestAuthenticate:
 
         auth.register_user(db_session, username, password)
 
-        with pytest.raises(ValueError, match="Invalid credentials"):
+        with pytest.raises(ValueError) as exc_info:
             auth.authenticate(db_session, username, "wrongpassword")
-
-    def test_authenticate_empty_credentials(self, db_session):
+        assert "Invalid credentials" in str(exc_info.value)
+
+    @pytest.mark.parametrize(
+        "username, password",
+        [("", "password"), ("username", "")],
+        ids=["empty_username", "empty_password"],
+    )
+    def test_authenticate_empty_credentials(self, db_session, username, password):
         """Test authentication fails with empty credentials."""
-        with pytest.raises(ValueError, match="required"):
-            auth.authenticate(db_session, "", "password")
-
-        with pytest.raises(ValueError, match="required"):
-            auth.authenticate(db_session, "username", "")
+        with pytest.raises(ValueError) as exc_info:
+            auth.authenticate(db_session, username, password)
+        assert "required" in str(exc_info.value)
 
 
 class TestValidateSession:
     """Tests for session validation."""
 
-    def test_validate_session_success(self, db_session):
+    def test_validate_session_success(self, db_session, authed_session):
         """Test successful session validation."""
-        username = "testuser"
-        password = "password123"
-
-        auth.register_user(db_session, username, password)
-        session = auth.authenticate(db_session, username, password)
+        session = authed_session
 
         validated_session = auth.validate_session(db_session, session.token)
 
@@ -114,13 +144,9 @@ class TestValidateSession:
         result = auth.validate_session(db_session, "")
         assert result is None
 
-    def test_validate_session_updates_last_activity(self, db_session):
+    def test_validate_session_updates_last_activity(self, db_session, authed_session):
         """Test that validation updates last_activity timestamp."""
-        username = "testuser"
-        password = "password123"
-
-        auth.register_user(db_session, username, password)
-        session = auth.authenticate(db_session, username, password)
+        session = authed_session
         original_activity = session.last_activity
 
         # Small delay to ensure timestamp difference
@@ -135,13 +161,9 @@ class TestValidateSession:
 class TestInvalidateSession:
     """Tests for session invalidation."""
 
-    def test_invalidate_session_success(self, db_session):
+    def test_invalidate_session_success(self, db_session, authed_session):
         """Test successful session invalidation."""
-        username = "testuser"
-        password = "password123"
-
-        auth.register_user(db_session, username, password)
-        session = auth.authenticate(db_session, username, password)
+        session = authed_session
 
         auth.invalidate_session(db_session, session.token)
 
@@ -162,24 +184,16 @@ class TestInvalidateSession:
 class TestCheckSessionTimeout:
     """Tests for session timeout checking."""
 
-    def test_check_session_timeout_not_expired(self, db_session):
+    def test_check_session_timeout_not_expired(self, db_session, authed_session):
         """Test that recent session is not timed out."""
-        username = "testuser"
-        password = "password123"
-
-        auth.register_user(db_session, username, password)
-        session = auth.authenticate(db_session, username, password)
+        session = authed_session
 
         is_timed_out = auth.check_session_timeout(session)
         assert is_timed_out is False
 
-    def test_check_session_timeout_expired(self, db_session):
+    def test_check_session_timeout_expired(self, db_session, authed_session):
         """Test that old session is timed out."""
-        username = "testuser"
-        password = "password123"
-
-        auth.register_user(db_session, username, password)
-        session = auth.authenticate(db_session, username, password)
+        session = authed_session
 
         # Manually set last_activity to 31 minutes ago
         session.last_activity = datetime.utcnow() - timedelta(minutes=31)
@@ -188,13 +202,9 @@ class TestCheckSessionTimeout:
         is_timed_out = auth.check_session_timeout(session)
         assert is_timed_out is True
 
-    def test_check_session_timeout_just_under_30_minutes(self, db_session):
+    def test_check_session_timeout_just_under_30_minutes(self, db_session, authed_session):
         """Test session just under 30 minutes is not timed out."""
-        username = "testuser"
-        password = "password123"
-
-        auth.register_user(db_session, username, password)
-        session = auth.authenticate(db_session, username, password)
+        session = authed_session
 
         # Set last_activity to 29 minutes 59 seconds ago
         session.last_activity = datetime.utcnow() - timedelta(minutes=29, seconds=59)
@@ -203,13 +213,9 @@ class TestCheckSessionTimeout:
         is_timed_out = auth.check_session_timeout(session)
         assert is_timed_out is False
 
-    def test_validate_session_with_timeout(self, db_session):
+    def test_validate_session_with_timeout(self, db_session, authed_session):
         """Test that validate_session invalidates timed out sessions."""
-        username = "testuser"
-        password = "password123"
-
-        auth.register_user(db_session, username, password)
-        session = auth.authenticate(db_session, username, password)
+        session = authed_session
 
         # Set last_activity to 31 minutes ago
         session.last_activity = datetime.utcnow() - timedelta(minutes=31)
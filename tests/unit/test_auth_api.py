@@ -1,11 +1,15 @@
 """Unit tests for authentication API endpoints."""
 
-import json
+import uuid
+from datetime import datetime
+
 import pytest
+from sqlalchemy.pool import StaticPool
 
+from packages import database
 from packages.api.app import create_app
-from packages.database import init_database, create_tables, get_session
-from packages.security import auth
+from packages.database import init_database, create_tables, drop_tables, get_session
+from packages.database.models import UserModel
 
 
 @pytest.fixture
@@ -13,12 +17,20 @@ def app():
     """Create Flask app for testing."""
     test_app = create_app({"TESTING": True, "REQUIRE_HTTPS": False})
     
-    # Initialize test database
-    init_database("sqlite:///:memory:")
+    # Initialize test database: one shared in-memory database, one pooled connection
+    init_database(
+        "sqlite:///file::memory:?cache=shared&uri=true",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
     create_tables()
-    
+
     yield test_app
 
+    drop_tables()
+    # Close the pooled connection so each test's engine is released
+    database._engine.dispose()
+
 
 @pytest.fixture
 def client(app):
@@ -27,12 +39,23 @@ def client(app):
 
 
 @pytest.fixture
-def registered_user():
-    """Create a registered user for testing."""
+def registered_user(test_password, test_password_hash):
+    """Create a registered user for testing.
+
+    The row is inserted directly with a precomputed hash; login still verifies
+    it with bcrypt.checkpw.
+    """
     db = get_session()
     try:
-        user = auth.register_user(db, "testuser", "testpassword123")
-        return {"username": "testuser", "password": "testpassword123", "user_id": user.id}
+        user = UserModel(
+            id=str(uuid.uuid4()),
+            username="testuser",
+            password_hash=test_password_hash,
+            created_at=datetime.utcnow(),
+        )
+        db.add(user)
+        db.commit()
+        return {"username": "testuser", "password": test_password, "user_id": user.id}
     finally:
         db.close()
 
@@ -44,12 +67,11 @@ class TestRegisterEndpoint:
         """Test successful user registration."""
         response = client.post(
             "/api/auth/register",
-            data=json.dumps({"username": "newuser", "password": "password123"}),
-            content_type="application/json",
+            json={"username": "newuser", "password": "password123"},
         )
 
         assert response.status_code == 201
-        data = json.loads(response.data)
+        data = response.get_json()
         assert "id" in data
         assert data["username"] == "newuser"
         assert "created_at" in data
@@ -59,12 +81,11 @@ class TestRegisterEndpoint:
         """Test registration with missing username."""
         response = client.post(
             "/api/auth/register",
-            data=json.dumps({"password": "password123"}),
-            content_type="application/json",
+            json={"password": "password123"},
         )
 
         assert response.status_code == 400
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data["error_code"] == "VALIDATION_ERROR"
         assert "username" in data["message"].lower()
 
@@ -72,12 +93,11 @@ class TestRegisterEndpoint:
         """Test registration with missing password."""
         response = client.post(
             "/api/auth/register",
-            data=json.dumps({"username": "newuser"}),
-            content_type="application/json",
+            json={"username": "newuser"},
         )
 
         assert response.status_code == 400
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data["error_code"] == "VALIDATION_ERROR"
         assert "password" in data["message"].lower()
 
@@ -90,19 +110,18 @@ class TestRegisterEndpoint:
         )
 
         assert response.status_code == 400
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data["error_code"] == "VALIDATION_ERROR"
 
     def test_register_duplicate_username(self, client, registered_user):
         """Test registration with duplicate username."""
         response = client.post(
             "/api/auth/register",
-            data=json.dumps({"username": "testuser", "password": "newpassword"}),
-            content_type="application/json",
+            json={"username": "testuser", "password": "newpassword"},
         )
 
         assert response.status_code == 409
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data["error_code"] == "CONFLICT"
         assert "already exists" in data["message"]
 
@@ -114,14 +133,14 @@ class TestLoginEndpoint:
         """Test successful login."""
         response = client.post(
             "/api/auth/login",
-            data=json.dumps(
-                {"username": registered_user["username"], "password": registered_user["password"]}
-            ),
-            content_type="application/json",
+            json={
+                "username": registered_user["username"],
+                "password": registered_user["password"],
+            },
         )
 
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert "token" in data
         assert data["user_id"] == registered_user["user_id"]
         assert "created_at" in data
@@ -131,12 +150,11 @@ class TestLoginEndpoint:
         """Test login with non-existent username."""
         response = client.post(
             "/api/auth/login",
-            data=json.dumps({"username": "nonexistent", "password": "password123"}),
-            content_type="application/json",
+            json={"username": "nonexistent", "password": "password123"},
         )
 
         assert response.status_code == 401
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data["error_code"] == "AUTHENTICATION_REQUIRED"
         assert "invalid credentials" in data["message"].lower()
 
@@ -144,12 +162,11 @@ class TestLoginEndpoint:
         """Test login with incorrect password."""
         response = client.post(
             "/api/auth/login",
-            data=json.dumps({"username": registered_user["username"], "password": "wrongpassword"}),
-            content_type="application/json",
+            json={"username": registered_user["username"], "password": "wrongpassword"},
         )
 
         assert response.status_code == 401
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data["error_code"] == "AUTHENTICATION_REQUIRED"
         assert "invalid credentials" in data["message"].lower()
 
@@ -157,12 +174,11 @@ class TestLoginEndpoint:
         """Test login with missing username."""
         response = client.post(
             "/api/auth/login",
-            data=json.dumps({"password": "password123"}),
-            content_type="application/json",
+            json={"password": "password123"},
         )
 
         assert response.status_code == 400
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data["error_code"] == "VALIDATION_ERROR"
         assert "username" in data["message"].lower()
 
@@ -170,12 +186,11 @@ class TestLoginEndpoint:
         """Test login with missing password."""
         response = client.post(
             "/api/auth/login",
-            data=json.dumps({"username": "testuser"}),
-            content_type="application/json",
+            json={"username": "testuser"},
         )
 
         assert response.status_code == 400
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data["error_code"] == "VALIDATION_ERROR"
         assert "password" in data["message"].lower()
 
@@ -188,7 +203,7 @@ class TestLoginEndpoint:
         )
 
         assert response.status_code == 400
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data["error_code"] == "VALIDATION_ERROR"
 
 
@@ -200,12 +215,12 @@ class TestLogoutEndpoint:
         # First login to get a token
         login_response = client.post(
             "/api/auth/login",
-            data=json.dumps(
-                {"username": registered_user["username"], "password": registered_user["password"]}
-            ),
-            content_type="application/json",
+            json={
+                "username": registered_user["username"],
+                "password": registered_user["password"],
+            },
         )
-        token = json.loads(login_response.data)["token"]
+        token = login_response.get_json()["token"]
 
         # Then logout
         response = client.post(
@@ -214,7 +229,7 @@ class TestLogoutEndpoint:
         )
 
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
         assert "message" in data
         assert "successful" in data["message"].lower()
 
@@ -223,7 +238,7 @@ class TestLogoutEndpoint:
         response = client.post("/api/auth/logout")
 
         assert response.status_code == 401
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data["error_code"] == "AUTHENTICATION_REQUIRED"
         assert "authorization header" in data["message"].lower()
 
@@ -235,7 +250,7 @@ class TestLogoutEndpoint:
         )
 
         assert response.status_code == 401
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data["error_code"] == "AUTHENTICATION_REQUIRED"
         assert "invalid authorization header" in data["message"].lower()
 
@@ -247,7 +262,7 @@ class TestLogoutEndpoint:
         )
 
         assert response.status_code == 401
-        data = json.loads(response.data)
+        data = response.get_json()
         assert data["error_code"] == "AUTHENTICATION_REQUIRED"
 
     def test_logout_with_invalid_token(self, client):
@@ -265,12 +280,12 @@ class TestLogoutEndpoint:
         # Login to get a token
         login_response = client.post(
             "/api/auth/login",
-            data=json.dumps(
-                {"username": registered_user["username"], "password": registered_user["password"]}
-            ),
-            content_type="application/json",
+            json={
+                "username": registered_user["username"],
+                "password": registered_user["password"],
+            },
         )
-        token = json.loads(login_response.data)["token"]
+        token = login_response.get_json()["token"]
 
         # First logout
         response1 = client.post(
@@ -290,53 +305,52 @@ class TestLogoutEndpoint:
 class TestAuthenticationFlow:
     """Integration tests for complete authentication flow."""
 
-    def test_register_login_logout_flow(self, client):
-        """Test complete authentication flow."""
-        # Register
-        register_response = client.post(
-            "/api/auth/register",
-            data=json.dumps({"username": "flowuser", "password": "flowpass123"}),
-            content_type="application/json",
-        )
-        assert register_response.status_code == 201
-
-        # Login
-        login_response = client.post(
-            "/api/auth/login",
-            data=json.dumps({"username": "flowuser", "password": "flowpass123"}),
-            content_type="application/json",
-        )
-        assert login_response.status_code == 200
-        token = json.loads(login_response.data)["token"]
-
-        # Logout
-        logout_response = client.post(
-            "/api/auth/logout",
-            headers={"Authorization": f"Bearer {token}"},
-        )
-        assert logout_response.status_code == 200
+    def test_login_logout_flow(self, client, bulk_seed_users, test_password):
+        """Test login and logout for several pre-seeded users."""
+        usernames = ["flowuser1", "flowuser2", "flowuser3"]
+        db = get_session()
+        try:
+            bulk_seed_users(db, [{"username": username} for username in usernames])
+        finally:
+            db.close()
+
+        for username in usernames:
+            # Login
+            login_response = client.post(
+                "/api/auth/login",
+                json={"username": username, "password": test_password},
+            )
+            assert login_response.status_code == 200
+            token = login_response.get_json()["token"]
+
+            # Logout
+            logout_response = client.post(
+                "/api/auth/logout",
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            assert logout_response.status_code == 200
 
     def test_multiple_logins_create_different_tokens(self, client, registered_user):
         """Test that multiple logins create different session tokens."""
         # First login
         response1 = client.post(
             "/api/auth/login",
-            data=json.dumps(
-                {"username": registered_user["username"], "password": registered_user["password"]}
-            ),
-            content_type="application/json",
+            json={
+                "username": registered_user["username"],
+                "password": registered_user["password"],
+            },
         )
-        token1 = json.loads(response1.data)["token"]
+        token1 = response1.get_json()["token"]
 
         # Second login
         response2 = client.post(
             "/api/auth/login",
-            data=json.dumps(
-                {"username": registered_user["username"], "password": registered_user["password"]}
-            ),
-            content_type="application/json",
+            json={
+                "username": registered_user["username"],
+                "password": registered_user["password"],
+            },
         )
-        token2 = json.loads(response2.data)["token"]
+        token2 = response2.get_json()["token"]
 
         # Tokens should be different
         assert token1 != token2
@@ -1,28 +1,51 @@
 """Unit tests for AWS cost calculation functions."""
 
 from decimal import Decimal
+from types import MappingProxyType
+
+import pytest
 
 from packages.tco_engine import aws_costs
 
+pytestmark = pytest.mark.fast
+
+# Shared read-only pricing tables, built once per module run.
+_EC2_PRICING = MappingProxyType(
+    {
+        "t3.small": Decimal("0.0208"),
+        "t3.medium": Decimal("0.0416"),
+        "m5.large": Decimal("0.096"),
+    }
+)
+_EBS_PRICING = MappingProxyType(
+    {
+        "gp3": Decimal("0.08"),
+        "st1": Decimal("0.045"),
+        "io2": Decimal("0.125"),
+        "iops": Decimal("0.065"),
+    }
+)
+_S3_PRICING = MappingProxyType({"standard": Decimal("0.023")})
+_DT_PRICING = MappingProxyType(
+    {
+        "internet_egress": Decimal("0.09"),
+        "inter_az": Decimal("0.01"),
+    }
+)
+
 
 class TestCalculateEC2Costs:
     """Tests for calculate_ec2_costs function."""
 
     def test_basic_ec2_cost_calculation(self):
         """Test EC2 cost calculation with typical values."""
-        ec2_pricing = {
-            "t3.small": Decimal("0.0208"),
-            "t3.medium": Decimal("0.0416"),
-            "m5.large": Decimal("0.096"),
-        }
-
         cost = aws_costs.calculate_ec2_costs(
             cpu_cores=2,
             memory_gb=4,
             instance_count=2,
             utilization_percentage=70,
             operating_hours_per_month=730,
-            ec2_pricing=ec2_pricing,
+            ec2_pricing=_EC2_PRICING,
             years=1,
         )
 
@@ -33,15 +56,13 @@ class TestCalculateEC2Costs:
 
     def test_ec2_cost_scales_with_years(self):
         """Test EC2 cost scales linearly with years."""
-        ec2_pricing = {"m5.large": Decimal("0.096")}
-
         cost_1_year = aws_costs.calculate_ec2_costs(
             cpu_cores=2,
             memory_gb=8,
             instance_count=1,
             utilization_percentage=50,
             operating_hours_per_month=730,
-            ec2_pricing=ec2_pricing,
+            ec2_pricing=_EC2_PRICING,
             years=1,
         )
 
@@ -51,7 +72,7 @@ class TestCalculateEC2Costs:
             instance_count=1,
             utilization_percentage=50,
             operating_hours_per_month=730,
-            ec2_pricing=ec2_pricing,
+            ec2_pricing=_EC2_PRICING,
             years=3,
         )
 
@@ -63,17 +84,11 @@ class TestCalculateEBSCosts:
 
     def test_basic_ebs_cost_calculation(self):
         """Test EBS cost calculation for standard SSD."""
-        ebs_pricing = {
-            "gp3": Decimal("0.08"),
-            "st1": Decimal("0.045"),
-            "io2": Decimal("0.125"),
-        }
-
         cost = aws_costs.calculate_ebs_costs(
             storage_capacity_gb=100,
             storage_type="SSD",
             storage_iops=None,
-            ebs_pricing=ebs_pricing,
+            ebs_pricing=_EBS_PRICING,
             years=1,
         )
 
@@ -83,16 +98,11 @@ class TestCalculateEBSCosts:
 
     def test_ebs_cost_with_provisioned_iops(self):
         """Test EBS cost calculation with provisioned IOPS."""
-        ebs_pricing = {
-            "io2": Decimal("0.125"),
-            "iops": Decimal("0.065"),
-        }
-
         cost = aws_costs.calculate_ebs_costs(
             storage_capacity_gb=100,
             storage_type="NVME",
             storage_iops=1000,
-            ebs_pricing=ebs_pricing,
+            ebs_pricing=_EBS_PRICING,
             years=1,
         )
 
@@ -106,11 +116,9 @@ class TestCalculateS3Costs:
 
     def test_basic_s3_cost_calculation(self):
         """Test S3 cost calculation."""
-        s3_pricing = {"standard": Decimal("0.023")}
-
         cost = aws_costs.calculate_s3_costs(
             storage_capacity_gb=500,
-            s3_pricing=s3_pricing,
+            s3_pricing=_S3_PRICING,
             years=1,
         )
 
@@ -120,17 +128,15 @@ class TestCalculateS3Costs:
 
     def test_s3_cost_scales_with_years(self):
         """Test S3 cost scales linearly with years."""
-        s3_pricing = {"standard": Decimal("0.023")}
-
         cost_1_year = aws_costs.calculate_s3_costs(
             storage_capacity_gb=1000,
-            s3_pricing=s3_pricing,
+            s3_pricing=_S3_PRICING,
             years=1,
         )
 
         cost_5_years = aws_costs.calculate_s3_costs(
             storage_capacity_gb=1000,
-            s3_pricing=s3_pricing,
+            s3_pricing=_S3_PRICING,
             years=5,
         )
 
@@ -142,15 +148,10 @@ class TestCalculateDataTransferCosts:
 
     def test_data_transfer_with_free_tier(self):
         """Test data transfer cost with AWS free tier (100GB/month)."""
-        data_transfer_pricing = {
-            "internet_egress": Decimal("0.09"),
-            "inter_az": Decimal("0.01"),
-        }
-
         # 150 GB total: 50 GB billable egress + 15 GB inter-AZ
         cost = aws_costs.calculate_data_transfer_costs(
             monthly_data_transfer_gb=150,
-            data_transfer_pricing=data_transfer_pricing,
+            data_transfer_pricing=_DT_PRICING,
             years=1,
         )
 
@@ -163,15 +164,10 @@ class TestCalculateDataTransferCosts:
 
     def test_data_transfer_below_free_tier(self):
         """Test data transfer cost when below free tier."""
-        data_transfer_pricing = {
-            "internet_egress": Decimal("0.09"),
-            "inter_az": Decimal("0.01"),
-        }
-
         # 50 GB total: 0 GB billable egress (under 100GB free tier) + 5 GB inter-AZ
         cost = aws_costs.calculate_data_transfer_costs(
             monthly_data_transfer_gb=50,
-            data_transfer_pricing=data_transfer_pricing,
+            data_transfer_pricing=_DT_PRICING,
             years=1,
         )
 
@@ -184,20 +180,15 @@ class TestCalculateDataTransferCosts:
 
     def test_data_transfer_scales_with_years(self):
         """Test data transfer cost scales linearly with years."""
-        data_transfer_pricing = {
-            "internet_egress": Decimal("0.09"),
-            "inter_az": Decimal("0.01"),
-        }
-
         cost_1_year = aws_costs.calculate_data_transfer_costs(
             monthly_data_transfer_gb=500,
-            data_transfer_pricing=data_transfer_pricing,
+            data_transfer_pricing=_DT_PRICING,
             years=1,
         )
 
         cost_3_years = aws_costs.calculate_data_transfer_costs(
             monthly_data_transfer_gb=500,
-            data_transfer_pricing=data_transfer_pricing,
+            data_transfer_pricing=_DT_PRICING,
             years=3,
         )
 
@@ -209,16 +200,10 @@ class TestInstanceTypeSelection:
 
     def test_selects_smallest_matching_instance(self):
         """Test that smallest instance meeting requirements is selected."""
-        ec2_pricing = {
-            "t3.small": Decimal("0.0208"),
-            "t3.medium": Decimal("0.0416"),
-            "m5.large": Decimal("0.096"),
-        }
-
         instance_type = aws_costs._select_instance_type(
             cpu_cores=2,
             memory_gb=2,
-            ec2_pricing=ec2_pricing,
+            ec2_pricing=_EC2_PRICING,
         )
 
         # Should select t3.small (2 vCPU, 2GB) as it's cheapest
@@ -226,15 +211,10 @@ class TestInstanceTypeSelection:
 
     def test_selects_cheapest_when_multiple_match(self):
         """Test that cheapest instance is selected when multiple match."""
-        ec2_pricing = {
-            "t3.medium": Decimal("0.0416"),
-            "m5.large": Decimal("0.096"),
-        }
-
         instance_type = aws_costs._select_instance_type(
             cpu_cores=2,
             memory_gb=4,
-            ec2_pricing=ec2_pricing,
+            ec2_pricing=_EC2_PRICING,
         )
 
         # Both match requirements, should select cheaper t3.medium
@@ -1,6 +1,8 @@
 """Unit tests for TCO calculator module."""
 
+from dataclasses import astuple
 from decimal import Decimal
+from operator import attrgetter
 
 import pytest
 
@@ -13,10 +15,55 @@ from packages.tco_engine.calculator import (
     project_costs,
 )
 
+EXPECTED_ONPREM_CATEGORIES = frozenset(
+    {"Hardware", "Power", "Cooling", "Maintenance", "Data Transfer"}
+)
+EXPECTED_AWS_CATEGORIES = frozenset({"EC2", "EBS", "S3", "Data Transfer"})
+
+_BASE_BREAKDOWN_RECURRING = CostBreakdown(
+    items=[
+        CostLineItem(
+            category="Power",
+            description="Electricity",
+            amount=Decimal("1000"),
+            unit="USD",
+        ),
+        CostLineItem(
+            category="Cooling",
+            description="HVAC",
+            amount=Decimal("400"),
+            unit="USD",
+        ),
+    ],
+    total=Decimal("1400"),
+    currency="USD",
+)
+_BASE_BREAKDOWN_WITH_HARDWARE = CostBreakdown(
+    items=[
+        CostLineItem(
+            category="Hardware",
+            description="Server hardware",
+            amount=Decimal("10000"),
+            unit="USD",
+        ),
+        CostLineItem(
+            category="Power",
+            description="Electricity",
+            amount=Decimal("1000"),
+            unit="USD",
+        ),
+    ],
+    total=Decimal("11000"),
+    currency="USD",
+)
+
+_category = attrgetter("category")
+_amount = attrgetter("amount")
+
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_config():
-    """Sample configuration for testing."""
+    """Sample configuration for testing (read-only, shared by the module)."""
     return Configuration(
         cpu_cores=4,
         memory_gb=16,
@@ -31,9 +78,9 @@ def sample_config():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_pricing():
-    """Sample AWS pricing data for testing."""
+    """Sample AWS pricing data for testing (read-only, shared by the module)."""
     return AWSPricing(
         ec2_pricing={
             "t3.micro": Decimal("0.0104"),
@@ -59,9 +106,15 @@ def sample_pricing():
     )
 
 
-def test_calculate_tco_returns_both_paths(sample_config, sample_pricing):
+@pytest.fixture(scope="module")
+def tco_result(sample_config, sample_pricing):
+    """Run calculate_tco once and share the result across the module."""
+    return calculate_tco(sample_config, sample_pricing)
+
+
+def test_calculate_tco_returns_both_paths(tco_result):
     """Test that calculate_tco returns both on_prem and aws cost breakdowns."""
-    result = calculate_tco(sample_config, sample_pricing)
+    result = tco_result
 
     assert "on_prem" in result
     assert "aws" in result
@@ -69,9 +122,9 @@ def test_calculate_tco_returns_both_paths(sample_config, sample_pricing):
     assert isinstance(result["aws"], dict)
 
 
-def test_calculate_tco_returns_three_year_periods(sample_config, sample_pricing):
+def test_calculate_tco_returns_three_year_periods(tco_result):
     """Test that calculate_tco returns costs for 1, 3, and 5 years."""
-    result = calculate_tco(sample_config, sample_pricing)
+    result = tco_result
 
     # Check on_prem has all three periods
     assert 1 in result["on_prem"]
@@ -84,88 +137,53 @@ def test_calculate_tco_returns_three_year_periods(sample_config, sample_pricing)
     assert 5 in result["aws"]
 
 
-def test_calculate_tco_returns_cost_breakdowns(sample_config, sample_pricing):
+@pytest.mark.parametrize("years", [1, 3, 5])
+def test_calculate_tco_returns_cost_breakdowns(tco_result, years):
     """Test that calculate_tco returns CostBreakdown objects."""
-    result = calculate_tco(sample_config, sample_pricing)
-
-    # Check on_prem breakdowns
-    for years in [1, 3, 5]:
-        breakdown = result["on_prem"][years]
-        assert isinstance(breakdown, CostBreakdown)
-        assert isinstance(breakdown.items, list)
-        assert isinstance(breakdown.total, Decimal)
-        assert breakdown.currency == "USD"
-
-    # Check aws breakdowns
-    for years in [1, 3, 5]:
-        breakdown = result["aws"][years]
+    for path in ["on_prem", "aws"]:
+        breakdown = tco_result[path][years]
         assert isinstance(breakdown, CostBreakdown)
         assert isinstance(breakdown.items, list)
         assert isinstance(breakdown.total, Decimal)
         assert breakdown.currency == "USD"
 
 
-def test_on_prem_breakdown_has_all_categories(sample_config, sample_pricing):
+def test_on_prem_breakdown_has_all_categories(tco_result):
     """Test that on_prem breakdown includes all required cost categories."""
-    result = calculate_tco(sample_config, sample_pricing)
-    breakdown = result["on_prem"][1]
-
-    categories = {item.category for item in breakdown.items}
-    expected_categories = {"Hardware", "Power", "Cooling", "Maintenance", "Data Transfer"}
+    breakdown = tco_result["on_prem"][1]
 
-    assert categories == expected_categories
+    assert set(map(_category, breakdown.items)) == EXPECTED_ONPREM_CATEGORIES
 
 
-def test_aws_breakdown_has_all_categories(sample_config, sample_pricing):
+def test_aws_breakdown_has_all_categories(tco_result):
     """Test that aws breakdown includes all required cost categories."""
-    result = calculate_tco(sample_config, sample_pricing)
-    breakdown = result["aws"][1]
-
-    categories = {item.category for item in breakdown.items}
-    expected_categories = {"EC2", "EBS", "S3", "Data Transfer"}
+    breakdown = tco_result["aws"][1]
 
-    assert categories == expected_categories
+    assert set(map(_category, breakdown.items)) == EXPECTED_AWS_CATEGORIES
 
 
-def test_cost_breakdown_total_matches_sum_of_items(sample_config, sample_pricing):
+@pytest.mark.parametrize("years", [1, 3, 5])
+def test_cost_breakdown_total_matches_sum_of_items(tco_result, years):
     """Test that breakdown total equals sum of all line items."""
-    result = calculate_tco(sample_config, sample_pricing)
-
-    # Check on_prem
-    for years in [1, 3, 5]:
-        breakdown = result["on_prem"][years]
-        calculated_total = sum(item.amount for item in breakdown.items)
-        assert breakdown.total == calculated_total
-
-    # Check aws
-    for years in [1, 3, 5]:
-        breakdown = result["aws"][years]
-        calculated_total = sum(item.amount for item in breakdown.items)
+    for path in ["on_prem", "aws"]:
+        breakdown = tco_result[path][years]
+        calculated_total = sum(map(_amount, breakdown.items), Decimal(0))
         assert breakdown.total == calculated_total
 
 
-def test_costs_are_non_negative(sample_config, sample_pricing):
+@pytest.mark.parametrize("years", [1, 3, 5])
+def test_costs_are_non_negative(tco_result, years):
     """Test that all costs are non-negative."""
-    result = calculate_tco(sample_config, sample_pricing)
-
-    # Check on_prem
-    for years in [1, 3, 5]:
-        breakdown = result["on_prem"][years]
-        assert breakdown.total >= 0
-        for item in breakdown.items:
-            assert item.amount >= 0
-
-    # Check aws
-    for years in [1, 3, 5]:
-        breakdown = result["aws"][years]
+    for path in ["on_prem", "aws"]:
+        breakdown = tco_result[path][years]
         assert breakdown.total >= 0
         for item in breakdown.items:
             assert item.amount >= 0
 
 
-def test_multi_year_costs_scale_appropriately(sample_config, sample_pricing):
+def test_multi_year_costs_scale_appropriately(tco_result):
     """Test that 3-year >= 1-year and 5-year >= 3-year for recurring costs."""
-    result = calculate_tco(sample_config, sample_pricing)
+    result = tco_result
 
     # Check on_prem scaling
     on_prem_1yr = result["on_prem"][1].total
@@ -184,29 +202,21 @@ def test_multi_year_costs_scale_appropriately(sample_config, sample_pricing):
     assert aws_5yr >= aws_3yr
 
 
-def test_project_costs_scales_recurring_costs():
-    """Test that project_costs scales recurring costs by year count."""
-    base_items = [
-        CostLineItem(
-            category="Power",
-            description="Electricity",
-            amount=Decimal("1000"),
-            unit="USD",
-        ),
-        CostLineItem(
-            category="Cooling",
-            description="HVAC",
-            amount=Decimal("400"),
-            unit="USD",
-        ),
-    ]
-    base_breakdown = CostBreakdown(
-        items=base_items,
-        total=Decimal("1400"),
-        currency="USD",
-    )
+@pytest.fixture(scope="module")
+def recurring_projections():
+    """Projections of a recurring-only breakdown, computed once per module."""
+    return project_costs(_BASE_BREAKDOWN_RECURRING, [1, 3, 5])
 
-    projections = project_costs(base_breakdown, [1, 3, 5])
+
+@pytest.fixture(scope="module")
+def hardware_projections():
+    """Projections of a breakdown with a one-time hardware cost, computed once."""
+    return project_costs(_BASE_BREAKDOWN_WITH_HARDWARE, [1, 3, 5])
+
+
+def test_project_costs_scales_recurring_costs(recurring_projections):
+    """Test that project_costs scales recurring costs by year count."""
+    projections = recurring_projections
 
     # 1 year should match base
     assert projections[1].total == Decimal("1400")
@@ -218,29 +228,9 @@ def test_project_costs_scales_recurring_costs():
     assert projections[5].total == Decimal("7000")
 
 
-def test_project_costs_does_not_scale_hardware():
+def test_project_costs_does_not_scale_hardware(hardware_projections):
     """Test that project_costs does not scale hardware costs (one-time)."""
-    base_items = [
-        CostLineItem(
-            category="Hardware",
-            description="Server hardware",
-            amount=Decimal("10000"),
-            unit="USD",
-        ),
-        CostLineItem(
-            category="Power",
-            description="Electricity",
-            amount=Decimal("1000"),
-            unit="USD",
-        ),
-    ]
-    base_breakdown = CostBreakdown(
-        items=base_items,
-        total=Decimal("11000"),
-        currency="USD",
-    )
-
-    projections = project_costs(base_breakdown, [1, 3, 5])
+    projections = hardware_projections
 
     # Hardware should stay the same, power should scale
     # 1 year: 10000 + 1000 = 11000
@@ -262,10 +252,7 @@ def test_cost_line_items_have_required_fields():
         unit="USD",
     )
 
-    assert item.category == "Test"
-    assert item.description == "Test description"
-    assert item.amount == Decimal("100")
-    assert item.unit == "USD"
+    assert astuple(item) == ("Test", "Test description", Decimal("100"), "USD")
 
 
 def test_cost_breakdown_has_required_fields():
@@ -280,9 +267,11 @@ def test_cost_breakdown_has_required_fields():
     ]
     breakdown = CostBreakdown(items=items, total=Decimal("100"), currency="USD")
 
-    assert breakdown.items == items
-    assert breakdown.total == Decimal("100")
-    assert breakdown.currency == "USD"
+    assert astuple(breakdown) == (
+        [("Test", "Test", Decimal("100"), "USD")],
+        Decimal("100"),
+        "USD",
+    )
 
 
 def test_configuration_dataclass():
@@ -300,16 +289,7 @@ def test_configuration_dataclass():
         operating_hours_per_month=720,
     )
 
-    assert config.cpu_cores == 4
-    assert config.memory_gb == 16
-    assert config.instance_count == 2
-    assert config.storage_type == "SSD"
-    assert config.storage_capacity_gb == 500
-    assert config.storage_iops == 3000
-    assert config.bandwidth_mbps == 100
-    assert config.monthly_data_transfer_gb == 1000
-    assert config.utilization_percentage == 70
-    assert config.operating_hours_per_month == 720
+    assert astuple(config) == (4, 16, 2, "SSD", 500, 3000, 100, 1000, 70, 720)
 
 
 def test_aws_pricing_dataclass():
@@ -321,7 +301,9 @@ def test_aws_pricing_dataclass():
         data_transfer_pricing={"internet_egress": Decimal("0.09")},
     )
 
-    assert pricing.ec2_pricing == {"m5.large": Decimal("0.096")}
-    assert pricing.ebs_pricing == {"gp3": Decimal("0.08")}
-    assert pricing.s3_pricing == {"standard": Decimal("0.023")}
-    assert pricing.data_transfer_pricing == {"internet_egress": Decimal("0.09")}
+    assert astuple(pricing) == (
+        {"m5.large": Decimal("0.096")},
+        {"gp3": Decimal("0.08")},
+        {"standard": Decimal("0.023")},
+        {"internet_egress": Decimal("0.09")},
+    )
@@ -5,35 +5,32 @@ import uuid
 from datetime import datetime
 
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import select
 
 from packages.database import models
 from packages.monitoring import collector
 
+FIXED_TS = datetime(2025, 1, 1, 0, 0, 0)
 
-@pytest.fixture
-def db_session():
-    """Create an in-memory SQLite database session for testing."""
-    engine = create_engine("sqlite:///:memory:")
-    models.Base.metadata.create_all(engine)
-    session_factory = sessionmaker(bind=engine)
-    session = session_factory()
-    yield session
-    session.close()
+# Deterministic IDs keep failure logs reproducible and skip os.urandom
+_UUIDS = [str(uuid.UUID(int=i)) for i in range(32)]
+
+# Sizes the mock generators pick from
+MOCK_MEMORY_TOTALS_MB = frozenset({1024, 2048, 4096, 8192, 16384})
+MOCK_STORAGE_TOTALS_GB = frozenset({50, 100, 250, 500, 1000})
 
 
 @pytest.fixture
 def sample_resource(db_session):
     """Create a sample resource in the database."""
     resource = models.ResourceModel(
-        id=str(uuid.uuid4()),
-        provision_id=str(uuid.uuid4()),
+        id=_UUIDS[0],
+        provision_id=_UUIDS[1],
         resource_type="vm",
         external_id="test-vm-001",
         status="running",
         connection_info_json="{}",
-        created_at=datetime.utcnow(),
+        created_at=FIXED_TS,
     )
     db_session.add(resource)
     db_session.commit()
@@ -45,7 +42,7 @@ def test_cpu_metrics_dataclass():
     metrics = collector.CPUMetrics(
         resource_id="test-id",
         utilization_percent=45.5,
-        timestamp=datetime.utcnow(),
+        timestamp=FIXED_TS,
     )
 
     assert metrics.resource_id == "test-id"
@@ -60,7 +57,7 @@ def test_memory_metrics_dataclass():
         used_mb=2048,
         total_mb=4096,
         utilization_percent=50.0,
-        timestamp=datetime.utcnow(),
+        timestamp=FIXED_TS,
     )
 
     assert metrics.resource_id == "test-id"
@@ -78,7 +75,7 @@ def test_storage_metrics_dataclass():
         utilization_percent=50.0,
         read_iops=1000,
         write_iops=500,
-        timestamp=datetime.utcnow(),
+        timestamp=FIXED_TS,
     )
 
     assert metrics.resource_id == "test-id"
@@ -96,7 +93,7 @@ def test_network_metrics_dataclass():
         bytes_sent=1000000,
         bytes_received=2000000,
         throughput_mbps=25.5,
-        timestamp=datetime.utcnow(),
+        timestamp=FIXED_TS,
     )
 
     assert metrics.resource_id == "test-id"
@@ -119,7 +116,7 @@ def test_generate_mock_memory_metrics():
     metrics = collector._generate_mock_memory_metrics("test-id")
 
     assert metrics.resource_id == "test-id"
-    assert metrics.total_mb in [1024, 2048, 4096, 8192, 16384]
+    assert metrics.total_mb in MOCK_MEMORY_TOTALS_MB
     assert 20.0 <= metrics.utilization_percent <= 80.0
     assert metrics.used_mb <= metrics.total_mb
     assert isinstance(metrics.timestamp, datetime)
@@ -130,7 +127,7 @@ def test_generate_mock_storage_metrics():
     metrics = collector._generate_mock_storage_metrics("test-id")
 
     assert metrics.resource_id == "test-id"
-    assert metrics.total_gb in [50, 100, 250, 500, 1000]
+    assert metrics.total_gb in MOCK_STORAGE_TOTALS_GB
     assert 30.0 <= metrics.utilization_percent <= 70.0
     assert metrics.used_gb <= metrics.total_gb
     assert 100 <= metrics.read_iops <= 5000
@@ -158,21 +155,13 @@ def test_collect_cpu_metrics_mock_mode(sample_resource, db_session):
     assert isinstance(metrics.timestamp, datetime)
 
     # Verify metrics stored in database
-    stored_metrics = (
-        db_session.query(models.MetricsModel)
-        .filter(models.MetricsModel.resource_id == sample_resource.id)
-        .first()
+    stored_metrics = db_session.scalar(
+        select(models.MetricsModel).where(models.MetricsModel.resource_id == sample_resource.id)
     )
     assert stored_metrics is not None
     assert stored_metrics.cpu_percent == metrics.utilization_percent
 
 
-def test_collect_cpu_metrics_resource_not_found(db_session):
-    """Test CPU metrics collection with non-existent resource."""
-    with pytest.raises(ValueError, match="Resource .* not found"):
-        collector.collect_cpu_metrics("non-existent-id", db_session)
-
-
 def test_collect_memory_metrics_mock_mode(sample_resource, db_session):
     """Test memory metrics collection in mock mode."""
     metrics = collector.collect_memory_metrics(sample_resource.id, db_session)
@@ -183,21 +172,13 @@ def test_collect_memory_metrics_mock_mode(sample_resource, db_session):
     assert isinstance(metrics.timestamp, datetime)
 
     # Verify metrics stored in database
-    stored_metrics = (
-        db_session.query(models.MetricsModel)
-        .filter(models.MetricsModel.resource_id == sample_resource.id)
-        .first()
+    stored_metrics = db_session.scalar(
+        select(models.MetricsModel).where(models.MetricsModel.resource_id == sample_resource.id)
     )
     assert stored_metrics is not None
     assert stored_metrics.memory_percent == metrics.utilization_percent
 
 
-def test_collect_memory_metrics_resource_not_found(db_session):
-    """Test memory metrics collection with non-existent resource."""
-    with pytest.raises(ValueError, match="Resource .* not found"):
-        collector.collect_memory_metrics("non-existent-id", db_session)
-
-
 def test_collect_storage_metrics_mock_mode(sample_resource, db_session):
     """Test storage metrics collection in mock mode."""
     metrics = collector.collect_storage_metrics(sample_resource.id, db_session)
@@ -210,21 +191,13 @@ def test_collect_storage_metrics_mock_mode(sample_resource, db_session):
     assert isinstance(metrics.timestamp, datetime)
 
     # Verify metrics stored in database
-    stored_metrics = (
-        db_session.query(models.MetricsModel)
-        .filter(models.MetricsModel.resource_id == sample_resource.id)
-        .first()
+    stored_metrics = db_session.scalar(
+        select(models.MetricsModel).where(models.MetricsModel.resource_id == sample_resource.id)
     )
     assert stored_metrics is not None
     assert stored_metrics.storage_used_gb == float(metrics.used_gb)
 
 
-def test_collect_storage_metrics_resource_not_found(db_session):
-    """Test storage metrics collection with non-existent resource."""
-    with pytest.raises(ValueError, match="Resource .* not found"):
-        collector.collect_storage_metrics("non-existent-id", db_session)
-
-
 def test_collect_network_metrics_mock_mode(sample_resource, db_session):
     """Test network metrics collection in mock mode."""
     metrics = collector.collect_network_metrics(sample_resource.id, db_session)
@@ -236,18 +209,26 @@ def test_collect_network_metrics_mock_mode(sample_resource, db_session):
     assert isinstance(metrics.timestamp, datetime)
 
     # Verify metrics stored in database
-    stored_metrics = (
-        db_session.query(models.MetricsModel)
-        .filter(models.MetricsModel.resource_id == sample_resource.id)
-        .first()
+    stored_metrics = db_session.scalar(
+        select(models.MetricsModel).where(models.MetricsModel.resource_id == sample_resource.id)
     )
     assert stored_metrics is not None
 
 
-def test_collect_network_metrics_resource_not_found(db_session):
-    """Test network metrics collection with non-existent resource."""
+@pytest.mark.parametrize(
+    "collect",
+    [
+        collector.collect_cpu_metrics,
+        collector.collect_memory_metrics,
+        collector.collect_storage_metrics,
+        collector.collect_network_metrics,
+    ],
+    ids=["cpu", "memory", "storage", "network"],
+)
+def test_collect_metrics_resource_not_found(collect, db_session):
+    """Test metrics collection with non-existent resource."""
     with pytest.raises(ValueError, match="Resource .* not found"):
-        collector.collect_network_metrics("non-existent-id", db_session)
+        collect("non-existent-id", db_session)
 
 
 def test_store_metrics_in_db(sample_resource, db_session):
@@ -255,7 +236,7 @@ def test_store_metrics_in_db(sample_resource, db_session):
     cpu_metrics = collector.CPUMetrics(
         resource_id=sample_resource.id,
         utilization_percent=45.5,
-        timestamp=datetime.utcnow(),
+        timestamp=FIXED_TS,
     )
 
     memory_metrics = collector.MemoryMetrics(
@@ -263,16 +244,14 @@ def test_store_metrics_in_db(sample_resource, db_session):
         used_mb=2048,
         total_mb=4096,
         utilization_percent=50.0,
-        timestamp=datetime.utcnow(),
+        timestamp=FIXED_TS,
     )
 
     collector._store_metrics_in_db(cpu_metrics, memory_metrics, None, None, db_session)
 
     # Verify metrics stored
-    stored_metrics = (
-        db_session.query(models.MetricsModel)
-        .filter(models.MetricsModel.resource_id == sample_resource.id)
-        .first()
+    stored_metrics = db_session.scalar(
+        select(models.MetricsModel).where(models.MetricsModel.resource_id == sample_resource.id)
     )
 
     assert stored_metrics is not None
@@ -301,7 +280,13 @@ def test_collect_all_metrics_handles_errors(db_session):
     collector._collect_all_metrics("non-existent-id", db_session)
 
 
-def test_start_collection_creates_thread(sample_resource, db_session):
+@pytest.fixture
+def no_collection(monkeypatch):
+    """Stub out per-resource collection so the worker thread does no DB work."""
+    monkeypatch.setattr(collector, "_collect_all_metrics", lambda *args, **kwargs: None)
+
+
+def test_start_collection_creates_thread(sample_resource, db_session, no_collection):
     """Test that start_collection creates and starts a thread."""
     resource_ids = [sample_resource.id]
 
@@ -314,25 +299,26 @@ def test_start_collection_creates_thread(sample_resource, db_session):
 
     # Stop the collection immediately
     thread.stop_event.set()
-    thread.join(timeout=2)
+    thread.join(timeout=1)
+    assert not thread.is_alive()
 
 
-def test_start_collection_multiple_resources_creates_thread(db_session):
+def test_start_collection_multiple_resources_creates_thread(db_session, no_collection):
     """Test starting collection for multiple resources creates thread."""
     # Create multiple resources
-    resources = []
-    for i in range(3):
-        resource = models.ResourceModel(
-            id=str(uuid.uuid4()),
-            provision_id=str(uuid.uuid4()),
+    resources = [
+        models.ResourceModel(
+            id=_UUIDS[2 + 2 * i],
+            provision_id=_UUIDS[3 + 2 * i],
             resource_type="vm",
             external_id=f"test-vm-{i:03d}",
             status="running",
             connection_info_json="{}",
-            created_at=datetime.utcnow(),
+            created_at=FIXED_TS,
         )
-        db_session.add(resource)
-        resources.append(resource)
+        for i in range(3)
+    ]
+    db_session.bulk_save_objects(resources)
     db_session.commit()
 
     resource_ids = [r.id for r in resources]
@@ -345,10 +331,11 @@ def test_start_collection_multiple_resources_creates_thread(db_session):
 
     # Stop collection immediately
     thread.stop_event.set()
-    thread.join(timeout=2)
+    thread.join(timeout=1)
+    assert not thread.is_alive()
 
 
-def test_start_collection_with_custom_interval(sample_resource, db_session):
+def test_start_collection_with_custom_interval(sample_resource, db_session, no_collection):
     """Test that start_collection accepts custom interval."""
     resource_ids = [sample_resource.id]
 
@@ -359,4 +346,5 @@ def test_start_collection_with_custom_interval(sample_resource, db_session):
 
     # Stop collection
     thread.stop_event.set()
-    thread.join(timeout=2)
+    thread.join(timeout=1)
+    assert not thread.is_alive()
@@ -4,35 +4,63 @@ import pytest
 from datetime import datetime
 from uuid import uuid4
 
+from sqlalchemy.orm import Session
+
 from packages.database.models import ConversationModel, SessionModel, UserModel
 from packages.qa_service import context
 
 
+def _create_session(connection, username: str, token: str) -> str:
+    """Flush a user and a valid session into the module transaction.
+
+    Returns:
+        The new session ID
+    """
+    now = datetime.utcnow()
+    with Session(bind=connection) as setup_session:
+        # Create a test user
+        user = UserModel(
+            id=str(uuid4()),
+            username=username,
+            password_hash="hashed_password",
+            created_at=now,
+        )
+        setup_session.add(user)
+
+        # Create a test session
+        session = SessionModel(
+            id=str(uuid4()),
+            user_id=user.id,
+            token=token,
+            created_at=now,
+            last_activity=now,
+            is_valid=True,
+        )
+        setup_session.add(session)
+        setup_session.flush()
+
+        return session.id
+
+
+@pytest.fixture(scope="module")
+def test_session_id(module_connection):
+    """Create a test user and session once per module and return the session ID.
+
+    The rows are flushed into the module transaction, never committed.
+    """
+    return _create_session(module_connection, "testuser", "test_token")
+
+
+@pytest.fixture(scope="module")
+def second_session_id(module_connection):
+    """Create a second user and session once per module for isolation tests."""
+    return _create_session(module_connection, "otheruser", "other_token")
+
+
 @pytest.fixture
-def test_session_id(db_session):
-    """Create a test session in the database and return its ID."""
-    # Create a test user
-    user = UserModel(
-        id=str(uuid4()),
-        username="testuser",
-        password_hash="hashed_password",
-        created_at=datetime.utcnow(),
-    )
-    db_session.add(user)
-
-    # Create a test session
-    session = SessionModel(
-        id=str(uuid4()),
-        user_id=user.id,
-        token="test_token",
-        created_at=datetime.utcnow(),
-        last_activity=datetime.utcnow(),
-        is_valid=True,
-    )
-    db_session.add(session)
-    db_session.commit()
-
-    return session.id
+def db_session(module_db_session, test_session_id):
+    """Roll back each test's conversation rows, keeping the module's user and session."""
+    return module_db_session
 
 
 class TestAddMessage:
@@ -116,6 +144,29 @@ class TestAddMessage:
         assert messages[0].role == "assistant"
 
 
+class TestAddMessages:
+    """Tests for adding a batch of messages to conversation history."""
+
+    def test_add_messages_invalid_role_writes_nothing(self, db_session, test_session_id):
+        """Test that one invalid role rejects the whole batch."""
+        session_id = test_session_id
+
+        with pytest.raises(ValueError, match="Invalid role"):
+            context.add_messages(
+                db_session,
+                session_id,
+                [("user", "Valid question", ""), ("invalid_role", "Bad message", "")],
+            )
+
+        assert context.get_history(db_session, session_id) == []
+
+    def test_add_messages_empty_batch(self, db_session, test_session_id):
+        """Test that an empty batch is a no-op."""
+        context.add_messages(db_session, test_session_id, [])
+
+        assert context.get_history(db_session, test_session_id) == []
+
+
 class TestGetHistory:
     """Tests for retrieving conversation history."""
 
@@ -124,10 +175,16 @@ class TestGetHistory:
         """Test retrieving conversation history with multiple messages."""
         session_id = test_session_id
 
-        # Add multiple messages
-        context.add_message(db_session, session_id, "user", "First question")
-        context.add_message(db_session, session_id, "assistant", "First answer")
-        context.add_message(db_session, session_id, "user", "Second question")
+        # Add multiple messages in one batch
+        context.add_messages(
+            db_session,
+            session_id,
+            [
+                ("user", "First question", ""),
+                ("assistant", "First answer", ""),
+                ("user", "Second question", ""),
+            ],
+        )
 
         # Get history
         history = context.get_history(db_session, session_id)
@@ -181,8 +238,9 @@ class TestGetHistory:
             ("assistant", "Message 4"),
         ]
 
-        for role, content in messages:
-            context.add_message(db_session, session_id, role, content)
+        context.add_messages(
+            db_session, session_id, [(role, content, "") for role, content in messages]
+        )
 
         # Get history
         history = context.get_history(db_session, session_id)
@@ -193,15 +251,16 @@ class TestGetHistory:
             assert history[i]["role"] == expected_role
             assert history[i]["content"] == expected_content
 
-        # Verify timestamps are in ascending order
+        # Verify timestamps are strictly ascending
         timestamps = [msg["timestamp"] for msg in history]
         assert timestamps == sorted(timestamps)
+        assert len(set(timestamps)) == len(timestamps)
 
     
-    def test_get_history_different_sessions(self, db_session, test_session_id):
+    def test_get_history_different_sessions(self, db_session, test_session_id, second_session_id):
         """Test that history is isolated per session."""
         session_id_1 = test_session_id
-        session_id_2 = str(uuid4())
+        session_id_2 = second_session_id
 
         # Add messages to first session
         context.add_message(db_session, session_id_1, "user", "Session 1 message")
@@ -257,11 +316,11 @@ class TestClearHistory:
 
     
     def test_clear_history_only_affects_target_session(
-        self, db_session, test_session_id
+        self, db_session, test_session_id, second_session_id
     ):
         """Test that clearing history only affects the target session."""
         session_id_1 = test_session_id
-        session_id_2 = str(uuid4())
+        session_id_2 = second_session_id
 
         # Add messages to both sessions
         context.add_message(db_session, session_id_1, "user", "Session 1 message")
@@ -1,13 +1,17 @@
 """Unit tests for monitoring dashboard data provider."""
 
+import itertools
 import uuid
+from contextlib import contextmanager
+from dataclasses import astuple
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import event, insert, text
+from sqlalchemy.orm import Session
 
-from packages.database.models import Base, MetricsModel, ResourceModel
+from packages.database.models import MetricsModel, ResourceModel
 from packages.monitoring.dashboard import (
     Alert,
     CurrentMetrics,
@@ -21,49 +25,140 @@ from packages.monitoring.dashboard import (
 )
 
 
+# Columns the dashboard tests rarely care about
+DEFAULT_METRIC_KW = {
+    "storage_used_gb": 100.0,
+    "storage_iops": 1000.0,
+    "network_in_mbps": 10.0,
+    "network_out_mbps": 10.0,
+}
+
+
+def make_metric(timestamp, cpu, memory, **overrides):
+    """Build metric column values with defaults for the columns a test ignores."""
+    return {
+        "timestamp": timestamp,
+        "cpu_percent": cpu,
+        "memory_percent": memory,
+        **DEFAULT_METRIC_KW,
+        **overrides,
+    }
+
+
+@pytest.fixture(scope="module")
+def _warm_statement_cache(module_connection):
+    """Run every dashboard query once so compiled statements are cached up front.
+
+    The throwaway rows live in a SAVEPOINT that is rolled back immediately.
+    """
+    savepoint = module_connection.begin_nested()
+    with Session(bind=module_connection) as warm_session:
+        now = datetime.utcnow()
+        warm_session.add_all(
+            [
+                ResourceModel(
+                    id="warm-resource",
+                    provision_id="warm-provision",
+                    resource_type="vm",
+                    external_id="warm",
+                    status="running",
+                    connection_info_json="{}",
+                    created_at=now,
+                ),
+                MetricsModel(
+                    id="warm-metric", resource_id="warm-resource", **make_metric(now, 1.0, 1.0)
+                ),
+            ]
+        )
+        warm_session.flush()
+        get_current_metrics("warm-resource", warm_session)
+        for time_range in TimeRange:
+            get_historical_metrics("warm-resource", time_range, warm_session)
+        get_alerts("warm-resource", warm_session)
+        get_resource_health("warm-resource", warm_session)
+    savepoint.rollback()
+
+
 @pytest.fixture
-def db_session():
-    """Create an in-memory SQLite database for testing."""
-    engine = create_engine("sqlite:///:memory:")
-    Base.metadata.create_all(engine)
-    session_factory = sessionmaker(bind=engine)
-    session = session_factory()
-    yield session
-    session.close()
+def db_session(module_db_session, _warm_statement_cache):
+    """Roll back each test's metric rows once the statement cache is warm."""
+    return module_db_session
 
 
 @pytest.fixture
-def sample_resource(db_session):
-    """Create a sample resource in the database."""
-    resource_id = str(uuid.uuid4())
-    resource = ResourceModel(
-        id=resource_id,
-        provision_id=str(uuid.uuid4()),
-        resource_type="vm",
-        external_id="ext-123",
-        status="running",
-        connection_info_json="{}",
-        created_at=datetime.utcnow(),
-    )
-    db_session.add(resource)
-    db_session.commit()
+def new_id():
+    """Return a cheap sequential ID factory; these tests never rely on UUID format."""
+    counter = itertools.count()
+    return lambda: f"id-{next(counter):08d}"
+
+
+@pytest.fixture(scope="module")
+def sample_resource(module_connection):
+    """Create a sample resource once per module and return its ID."""
+    resource_id = "resource-00000001"
+    with Session(bind=module_connection) as setup_session:
+        setup_session.add(
+            ResourceModel(
+                id=resource_id,
+                provision_id="provision-00000001",
+                resource_type="vm",
+                external_id="ext-123",
+                status="running",
+                connection_info_json="{}",
+                created_at=datetime.utcnow(),
+            )
+        )
+        setup_session.flush()
     return resource_id
 
 
-def test_get_current_metrics_with_existing_metrics(db_session, sample_resource):
+@pytest.fixture
+def insert_metrics(new_id):
+    """Return a helper that bulk inserts metric rows for a resource and commits once.
+
+    Rows go through a Core executemany INSERT, skipping ORM unit-of-work work.
+    """
+
+    def _insert(session, resource_id, rows):
+        """Insert rows (column values without id or resource_id) for resource_id."""
+        session.execute(
+            insert(MetricsModel),
+            [{"id": new_id(), "resource_id": resource_id, **row} for row in rows],
+        )
+        session.commit()
+
+    return _insert
+
+
+@pytest.fixture
+def query_counter(db_engine):
+    """Return a context manager that counts SELECT statements sent to the engine."""
+
+    @contextmanager
+    def _count():
+        counter = SimpleNamespace(count=0)
+
+        def _on_execute(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                counter.count += 1
+
+        event.listen(db_engine, "before_cursor_execute", _on_execute)
+        try:
+            yield counter
+        finally:
+            event.remove(db_engine, "before_cursor_execute", _on_execute)
+
+    return _count
+
+
+def test_get_current_metrics_with_existing_metrics(db_session, sample_resource, new_id):
     """Test get_current_metrics returns latest metrics for a resource."""
     # Create metrics
     now = datetime.utcnow()
     metric = MetricsModel(
-        id=str(uuid.uuid4()),
+        id=new_id(),
         resource_id=sample_resource,
-        timestamp=now,
-        cpu_percent=45.5,
-        memory_percent=60.2,
-        storage_used_gb=100.0,
-        storage_iops=1000.0,
-        network_in_mbps=10.5,
-        network_out_mbps=8.3,
+        **make_metric(now, 45.5, 60.2, network_in_mbps=10.5, network_out_mbps=8.3),
     )
     db_session.add(metric)
     db_session.commit()
@@ -80,37 +175,22 @@ def test_get_current_metrics_with_existing_metrics(db_session, sample_resource):
     assert result.timestamp == now
 
 
-def test_get_current_metrics_returns_most_recent(db_session, sample_resource):
+def test_get_current_metrics_returns_most_recent(db_session, sample_resource, new_id):
     """Test get_current_metrics returns the most recent metric when multiple exist."""
+    now = datetime.utcnow()
+
     # Create older metric
-    old_time = datetime.utcnow() - timedelta(minutes=5)
+    old_time = now - timedelta(minutes=5)
     old_metric = MetricsModel(
-        id=str(uuid.uuid4()),
-        resource_id=sample_resource,
-        timestamp=old_time,
-        cpu_percent=30.0,
-        memory_percent=40.0,
-        storage_used_gb=50.0,
-        storage_iops=500.0,
-        network_in_mbps=5.0,
-        network_out_mbps=5.0,
+        id=new_id(), resource_id=sample_resource, **make_metric(old_time, 30.0, 40.0)
     )
-    db_session.add(old_metric)
 
     # Create newer metric
-    new_time = datetime.utcnow()
+    new_time = now
     new_metric = MetricsModel(
-        id=str(uuid.uuid4()),
-        resource_id=sample_resource,
-        timestamp=new_time,
-        cpu_percent=75.0,
-        memory_percent=80.0,
-        storage_used_gb=150.0,
-        storage_iops=2000.0,
-        network_in_mbps=20.0,
-        network_out_mbps=15.0,
+        id=new_id(), resource_id=sample_resource, **make_metric(new_time, 75.0, 80.0)
     )
-    db_session.add(new_metric)
+    db_session.add_all([old_metric, new_metric])
     db_session.commit()
 
     # Get current metrics
@@ -135,135 +215,63 @@ def test_get_current_metrics_nonexistent_resource(db_session):
         get_current_metrics(fake_id, db_session)
 
 
-def test_get_historical_metrics_one_hour(db_session, sample_resource):
-    """Test get_historical_metrics retrieves metrics for 1 hour time range."""
+def test_metrics_query_uses_index(db_session, sample_resource, insert_metrics):
+    """Test the latest-metric lookup is served by ix_metrics_resource_timestamp."""
     now = datetime.utcnow()
-
-    # Create metrics within 1 hour
-    for i in range(3):
-        metric = MetricsModel(
-            id=str(uuid.uuid4()),
-            resource_id=sample_resource,
-            timestamp=now - timedelta(minutes=i * 20),
-            cpu_percent=50.0 + i,
-            memory_percent=60.0 + i,
-            storage_used_gb=100.0,
-            storage_iops=1000.0,
-            network_in_mbps=10.0,
-            network_out_mbps=10.0,
-        )
-        db_session.add(metric)
-
-    # Create metric outside 1 hour (should not be included)
-    old_metric = MetricsModel(
-        id=str(uuid.uuid4()),
-        resource_id=sample_resource,
-        timestamp=now - timedelta(hours=2),
-        cpu_percent=10.0,
-        memory_percent=10.0,
-        storage_used_gb=50.0,
-        storage_iops=500.0,
-        network_in_mbps=5.0,
-        network_out_mbps=5.0,
+    insert_metrics(
+        db_session,
+        sample_resource,
+        [make_metric(now - timedelta(minutes=i), 50.0, 60.0) for i in range(1000)],
     )
-    db_session.add(old_metric)
-    db_session.commit()
 
-    # Get historical metrics
-    result = get_historical_metrics(sample_resource, TimeRange.ONE_HOUR, db_session)
-
-    # Verify
-    assert isinstance(result, HistoricalMetrics)
-    assert result.resource_id == sample_resource
-    assert result.time_range == TimeRange.ONE_HOUR
-    assert len(result.data_points) == 3  # Only metrics within 1 hour
-
-
-def test_get_historical_metrics_twenty_four_hours(db_session, sample_resource):
-    """Test get_historical_metrics retrieves metrics for 24 hour time range."""
-    now = datetime.utcnow()
-
-    # Create metrics within 24 hours
-    for i in range(5):
-        metric = MetricsModel(
-            id=str(uuid.uuid4()),
-            resource_id=sample_resource,
-            timestamp=now - timedelta(hours=i * 4),
-            cpu_percent=40.0 + i,
-            memory_percent=50.0 + i,
-            storage_used_gb=100.0,
-            storage_iops=1000.0,
-            network_in_mbps=10.0,
-            network_out_mbps=10.0,
-        )
-        db_session.add(metric)
-
-    # Create metric outside 24 hours
-    old_metric = MetricsModel(
-        id=str(uuid.uuid4()),
-        resource_id=sample_resource,
-        timestamp=now - timedelta(hours=30),
-        cpu_percent=10.0,
-        memory_percent=10.0,
-        storage_used_gb=50.0,
-        storage_iops=500.0,
-        network_in_mbps=5.0,
-        network_out_mbps=5.0,
-    )
-    db_session.add(old_metric)
-    db_session.commit()
-
-    # Get historical metrics
-    result = get_historical_metrics(sample_resource, TimeRange.TWENTY_FOUR_HOURS, db_session)
-
-    # Verify
-    assert result.time_range == TimeRange.TWENTY_FOUR_HOURS
-    assert len(result.data_points) == 5
-
-
-def test_get_historical_metrics_seven_days(db_session, sample_resource):
-    """Test get_historical_metrics retrieves metrics for 7 day time range."""
+    plan = db_session.execute(
+        text(
+            "EXPLAIN QUERY PLAN SELECT * FROM metrics WHERE resource_id = :resource_id "
+            "ORDER BY timestamp DESC LIMIT 1"
+        ),
+        {"resource_id": sample_resource},
+    ).all()
+
+    details = " ".join(row[-1] for row in plan)
+    assert "USING INDEX ix_metrics_resource_timestamp" in details
+    assert "TEMP B-TREE" not in details  # no separate sort step
+    assert get_current_metrics(sample_resource, db_session).timestamp == now
+
+
+@pytest.mark.parametrize(
+    "time_range, step, n_inside, outside",
+    [
+        (TimeRange.ONE_HOUR, timedelta(minutes=20), 3, timedelta(hours=2)),
+        (TimeRange.TWENTY_FOUR_HOURS, timedelta(hours=4), 5, timedelta(hours=30)),
+        (TimeRange.SEVEN_DAYS, timedelta(days=1), 7, timedelta(days=10)),
+    ],
+    ids=["one_hour", "twenty_four_hours", "seven_days"],
+)
+def test_get_historical_metrics_time_range(
+    db_session, sample_resource, insert_metrics, time_range, step, n_inside, outside
+):
+    """Test get_historical_metrics only returns metrics inside the time range."""
     now = datetime.utcnow()
 
-    # Create metrics within 7 days
-    for i in range(7):
-        metric = MetricsModel(
-            id=str(uuid.uuid4()),
-            resource_id=sample_resource,
-            timestamp=now - timedelta(days=i),
-            cpu_percent=30.0 + i,
-            memory_percent=40.0 + i,
-            storage_used_gb=100.0,
-            storage_iops=1000.0,
-            network_in_mbps=10.0,
-            network_out_mbps=10.0,
-        )
-        db_session.add(metric)
+    # Create metrics within the time range
+    timestamps = [now - step * i for i in range(n_inside)]
+    rows = [make_metric(ts, 50.0 + i, 60.0 + i) for i, ts in enumerate(timestamps)]
 
-    # Create metric outside 7 days
-    old_metric = MetricsModel(
-        id=str(uuid.uuid4()),
-        resource_id=sample_resource,
-        timestamp=now - timedelta(days=10),
-        cpu_percent=10.0,
-        memory_percent=10.0,
-        storage_used_gb=50.0,
-        storage_iops=500.0,
-        network_in_mbps=5.0,
-        network_out_mbps=5.0,
-    )
-    db_session.add(old_metric)
-    db_session.commit()
+    # Create metric outside the time range (should not be included)
+    rows.append(make_metric(now - outside, 10.0, 10.0))
+    insert_metrics(db_session, sample_resource, rows)
 
     # Get historical metrics
-    result = get_historical_metrics(sample_resource, TimeRange.SEVEN_DAYS, db_session)
+    result = get_historical_metrics(sample_resource, time_range, db_session)
 
     # Verify
-    assert result.time_range == TimeRange.SEVEN_DAYS
-    assert len(result.data_points) == 7
+    assert isinstance(result, HistoricalMetrics)
+    assert result.resource_id == sample_resource
+    assert result.time_range == time_range
+    assert len(result.data_points) == n_inside
 
 
-def test_get_historical_metrics_sorted_by_timestamp(db_session, sample_resource):
+def test_get_historical_metrics_sorted_by_timestamp(db_session, sample_resource, insert_metrics):
     """Test get_historical_metrics returns data points sorted by timestamp ascending."""
     now = datetime.utcnow()
 
@@ -275,45 +283,27 @@ def test_get_historical_metrics_sorted_by_timestamp(db_session, sample_resource)
         now - timedelta(minutes=20),
     ]
 
-    for ts in timestamps:
-        metric = MetricsModel(
-            id=str(uuid.uuid4()),
-            resource_id=sample_resource,
-            timestamp=ts,
-            cpu_percent=50.0,
-            memory_percent=60.0,
-            storage_used_gb=100.0,
-            storage_iops=1000.0,
-            network_in_mbps=10.0,
-            network_out_mbps=10.0,
-        )
-        db_session.add(metric)
-    db_session.commit()
+    insert_metrics(db_session, sample_resource, [make_metric(ts, 50.0, 60.0) for ts in timestamps])
 
     # Get historical metrics
     result = get_historical_metrics(sample_resource, TimeRange.ONE_HOUR, db_session)
 
     # Verify sorted ascending
     assert len(result.data_points) == 4
-    for i in range(len(result.data_points) - 1):
-        ts1 = datetime.fromisoformat(result.data_points[i]["timestamp"])
-        ts2 = datetime.fromisoformat(result.data_points[i + 1]["timestamp"])
-        assert ts1 < ts2
+    # ISO-8601 strings of naive UTC datetimes sort lexicographically
+    ts = [point["timestamp"] for point in result.data_points]
+    assert ts == sorted(set(ts))
 
 
-def test_get_historical_metrics_data_point_structure(db_session, sample_resource):
+def test_get_historical_metrics_data_point_structure(db_session, sample_resource, new_id):
     """Test get_historical_metrics data points have correct structure."""
     now = datetime.utcnow()
     metric = MetricsModel(
-        id=str(uuid.uuid4()),
+        id=new_id(),
         resource_id=sample_resource,
-        timestamp=now,
-        cpu_percent=45.5,
-        memory_percent=60.2,
-        storage_used_gb=100.5,
-        storage_iops=1000.0,
-        network_in_mbps=10.5,
-        network_out_mbps=8.3,
+        **make_metric(
+            now, 45.5, 60.2, storage_used_gb=100.5, network_in_mbps=10.5, network_out_mbps=8.3
+        ),
     )
     db_session.add(metric)
     db_session.commit()
@@ -335,111 +325,32 @@ def test_get_historical_metrics_data_point_structure(db_session, sample_resource
     assert point["network"] == 18.8  # 10.5 + 8.3
 
 
-def test_get_alerts_with_high_cpu_utilization(db_session, sample_resource):
-    """Test get_alerts generates alert when CPU exceeds 80%."""
-    now = datetime.utcnow()
-    metric = MetricsModel(
-        id=str(uuid.uuid4()),
-        resource_id=sample_resource,
-        timestamp=now,
-        cpu_percent=85.0,  # Above 80% threshold
-        memory_percent=50.0,
-        storage_used_gb=100.0,
-        storage_iops=1000.0,
-        network_in_mbps=10.0,
-        network_out_mbps=10.0,
-    )
-    db_session.add(metric)
-    db_session.commit()
-
-    # Get alerts
-    alerts = get_alerts(sample_resource, db_session)
-
-    # Verify CPU alert generated
-    assert len(alerts) == 1
-    assert alerts[0].metric_type == "cpu"
-    assert alerts[0].current_value == 85.0
-    assert alerts[0].threshold == 80.0
-    assert alerts[0].severity == "warning"
-
-
-def test_get_alerts_with_high_memory_utilization(db_session, sample_resource):
-    """Test get_alerts generates alert when memory exceeds 80%."""
-    now = datetime.utcnow()
-    metric = MetricsModel(
-        id=str(uuid.uuid4()),
-        resource_id=sample_resource,
-        timestamp=now,
-        cpu_percent=50.0,
-        memory_percent=92.0,  # Above 80% threshold
-        storage_used_gb=100.0,
-        storage_iops=1000.0,
-        network_in_mbps=10.0,
-        network_out_mbps=10.0,
-    )
-    db_session.add(metric)
-    db_session.commit()
-
-    # Get alerts
-    alerts = get_alerts(sample_resource, db_session)
-
-    # Verify memory alert generated
-    assert len(alerts) == 1
-    assert alerts[0].metric_type == "memory"
-    assert alerts[0].current_value == 92.0
-    assert alerts[0].threshold == 80.0
-    assert alerts[0].severity == "critical"  # Above 90%
-
-
-def test_get_alerts_with_multiple_high_utilization(db_session, sample_resource):
-    """Test get_alerts generates multiple alerts when multiple metrics exceed threshold."""
+@pytest.mark.parametrize(
+    "cpu, memory, expected",
+    [
+        (85.0, 50.0, {"cpu": "warning"}),
+        (50.0, 92.0, {"memory": "critical"}),
+        (85.0, 88.0, {"cpu": "warning", "memory": "warning"}),
+        (50.0, 60.0, {}),
+    ],
+    ids=["high_cpu", "high_memory", "multiple_high", "normal"],
+)
+def test_get_alerts_utilization(db_session, sample_resource, new_id, cpu, memory, expected):
+    """Test get_alerts raises one alert per metric above the 80% threshold."""
     now = datetime.utcnow()
-    metric = MetricsModel(
-        id=str(uuid.uuid4()),
-        resource_id=sample_resource,
-        timestamp=now,
-        cpu_percent=85.0,  # Above 80%
-        memory_percent=88.0,  # Above 80%
-        storage_used_gb=100.0,
-        storage_iops=1000.0,
-        network_in_mbps=10.0,
-        network_out_mbps=10.0,
-    )
+    metric = MetricsModel(id=new_id(), resource_id=sample_resource, **make_metric(now, cpu, memory))
     db_session.add(metric)
     db_session.commit()
 
     # Get alerts
     alerts = get_alerts(sample_resource, db_session)
 
-    # Verify both alerts generated
-    assert len(alerts) == 2
-    metric_types = {alert.metric_type for alert in alerts}
-    assert "cpu" in metric_types
-    assert "memory" in metric_types
-
-
-def test_get_alerts_with_normal_utilization(db_session, sample_resource):
-    """Test get_alerts returns empty list when utilization is normal."""
-    now = datetime.utcnow()
-    metric = MetricsModel(
-        id=str(uuid.uuid4()),
-        resource_id=sample_resource,
-        timestamp=now,
-        cpu_percent=50.0,  # Below 80%
-        memory_percent=60.0,  # Below 80%
-        storage_used_gb=100.0,
-        storage_iops=1000.0,
-        network_in_mbps=10.0,
-        network_out_mbps=10.0,
-    )
-    db_session.add(metric)
-    db_session.commit()
-
-    # Get alerts
-    alerts = get_alerts(sample_resource, db_session)
-
-    # Verify no alerts
-    assert len(alerts) == 0
+    # Verify one alert per breached metric, with severity above 90% critical
+    assert {alert.metric_type: alert.severity for alert in alerts} == expected
+    values = {"cpu": cpu, "memory": memory}
+    for alert in alerts:
+        assert alert.current_value == values[alert.metric_type]
+        assert alert.threshold == 80.0
 
 
 def test_get_alerts_no_metrics_returns_empty(db_session, sample_resource):
@@ -451,20 +362,10 @@ def test_get_alerts_no_metrics_returns_empty(db_session, sample_resource):
     assert len(alerts) == 0
 
 
-def test_get_resource_health_healthy(db_session, sample_resource):
+def test_get_resource_health_healthy(db_session, sample_resource, new_id):
     """Test get_resource_health returns healthy status for recent metrics."""
     now = datetime.utcnow()
-    metric = MetricsModel(
-        id=str(uuid.uuid4()),
-        resource_id=sample_resource,
-        timestamp=now,  # Recent metric
-        cpu_percent=50.0,
-        memory_percent=60.0,
-        storage_used_gb=100.0,
-        storage_iops=1000.0,
-        network_in_mbps=10.0,
-        network_out_mbps=10.0,
-    )
+    metric = MetricsModel(id=new_id(), resource_id=sample_resource, **make_metric(now, 50.0, 60.0))
     db_session.add(metric)
     db_session.commit()
 
@@ -479,19 +380,11 @@ def test_get_resource_health_healthy(db_session, sample_resource):
     assert health.last_successful_collection == now
 
 
-def test_get_resource_health_unreachable_stale_metrics(db_session, sample_resource):
+def test_get_resource_health_unreachable_stale_metrics(db_session, sample_resource, new_id):
     """Test get_resource_health returns unreachable status for stale metrics."""
     old_time = datetime.utcnow() - timedelta(minutes=5)  # Older than 2 minutes
     metric = MetricsModel(
-        id=str(uuid.uuid4()),
-        resource_id=sample_resource,
-        timestamp=old_time,
-        cpu_percent=50.0,
-        memory_percent=60.0,
-        storage_used_gb=100.0,
-        storage_iops=1000.0,
-        network_in_mbps=10.0,
-        network_out_mbps=10.0,
+        id=new_id(), resource_id=sample_resource, **make_metric(old_time, 50.0, 60.0)
     )
     db_session.add(metric)
     db_session.commit()
@@ -523,82 +416,75 @@ def test_get_resource_health_nonexistent_resource(db_session):
         get_resource_health(fake_id, db_session)
 
 
-def test_time_range_enum():
-    """Test TimeRange enum has correct values."""
-    assert TimeRange.ONE_HOUR.value == "1h"
-    assert TimeRange.TWENTY_FOUR_HOURS.value == "24h"
-    assert TimeRange.SEVEN_DAYS.value == "7d"
-
-
-def test_current_metrics_dataclass():
-    """Test CurrentMetrics dataclass can be instantiated."""
+@pytest.mark.fast
+def test_dashboard_dataclass_shapes():
+    """Test the dashboard enum and dataclasses hold the values they are given."""
     now = datetime.utcnow()
-    metrics = CurrentMetrics(
-        resource_id="test-id",
-        cpu_percent=50.0,
-        memory_percent=60.0,
-        storage_percent=70.0,
-        network_mbps=20.0,
-        timestamp=now,
-    )
-
-    assert metrics.resource_id == "test-id"
-    assert metrics.cpu_percent == 50.0
-    assert metrics.memory_percent == 60.0
-    assert metrics.storage_percent == 70.0
-    assert metrics.network_mbps == 20.0
-    assert metrics.timestamp == now
-
-
-def test_historical_metrics_dataclass():
-    """Test HistoricalMetrics dataclass can be instantiated."""
     data_points = [
         {"timestamp": "2024-01-01T00:00:00", "cpu": 50.0, "memory": 60.0},
         {"timestamp": "2024-01-01T00:01:00", "cpu": 55.0, "memory": 65.0},
     ]
 
-    metrics = HistoricalMetrics(
-        resource_id="test-id",
-        time_range=TimeRange.ONE_HOUR,
-        data_points=data_points,
-    )
-
-    assert metrics.resource_id == "test-id"
-    assert metrics.time_range == TimeRange.ONE_HOUR
-    assert len(metrics.data_points) == 2
-
-
-def test_alert_dataclass():
-    """Test Alert dataclass can be instantiated."""
+    assert [member.value for member in TimeRange] == ["1h", "24h", "7d"]
+    assert astuple(
+        CurrentMetrics(
+            resource_id="test-id",
+            cpu_percent=50.0,
+            memory_percent=60.0,
+            storage_percent=70.0,
+            network_mbps=20.0,
+            timestamp=now,
+        )
+    ) == ("test-id", 50.0, 60.0, 70.0, 20.0, now)
+    assert astuple(
+        HistoricalMetrics(
+            resource_id="test-id",
+            time_range=TimeRange.ONE_HOUR,
+            data_points=data_points,
+        )
+    ) == ("test-id", TimeRange.ONE_HOUR, data_points)
+    assert astuple(
+        Alert(
+            resource_id="test-id",
+            metric_type="cpu",
+            current_value=85.0,
+            threshold=80.0,
+            severity="warning",
+            timestamp=now,
+        )
+    ) == ("test-id", "cpu", 85.0, 80.0, "warning", now)
+    assert astuple(
+        ResourceHealth(
+            resource_id="test-id",
+            is_reachable=True,
+            last_successful_collection=now,
+            status="healthy",
+        )
+    ) == ("test-id", True, now, "healthy")
+
+
+@pytest.mark.parametrize(
+    "call, max_queries",
+    [
+        (get_current_metrics, 1),
+        (lambda rid, db: get_historical_metrics(rid, TimeRange.SEVEN_DAYS, db), 1),
+        (get_alerts, 1),
+        (get_resource_health, 2),
+    ],
+    ids=["current_metrics", "historical_metrics", "alerts", "resource_health"],
+)
+def test_dashboard_query_count_is_constant(
+    db_session, sample_resource, insert_metrics, query_counter, call, max_queries
+):
+    """Test dashboard helpers issue a fixed number of SELECTs regardless of row count."""
     now = datetime.utcnow()
-    alert = Alert(
-        resource_id="test-id",
-        metric_type="cpu",
-        current_value=85.0,
-        threshold=80.0,
-        severity="warning",
-        timestamp=now,
+    insert_metrics(
+        db_session,
+        sample_resource,
+        [make_metric(now - timedelta(hours=i), 50.0, 60.0) for i in range(20)],
     )
 
-    assert alert.resource_id == "test-id"
-    assert alert.metric_type == "cpu"
-    assert alert.current_value == 85.0
-    assert alert.threshold == 80.0
-    assert alert.severity == "warning"
-    assert alert.timestamp == now
-
-
-def test_resource_health_dataclass():
-    """Test ResourceHealth dataclass can be instantiated."""
-    now = datetime.utcnow()
-    health = ResourceHealth(
-        resource_id="test-id",
-        is_reachable=True,
-        last_successful_collection=now,
-        status="healthy",
-    )
+    with query_counter() as counter:
+        call(sample_resource, db_session)
 
-    assert health.resource_id == "test-id"
-    assert health.is_reachable is True
-    assert health.last_successful_collection == now
-    assert health.status == "healthy"
+    assert 1 <= counter.count <= max_queries
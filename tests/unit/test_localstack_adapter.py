@@ -1,10 +1,18 @@
 """Unit tests for LocalStack adapter."""
 
-import uuid
-from unittest.mock import MagicMock, patch
+import asyncio
+import threading
+import time
+from dataclasses import astuple
+from types import MappingProxyType
+from unittest.mock import ANY, MagicMock, Mock
 
 import pytest
+from hypothesis import given
+from hypothesis import strategies as st
 
+from packages.database import models
+from packages.provisioner import localstack_adapter
 from packages.provisioner.localstack_adapter import (
     ComputeSpec,
     EBSVolume,
@@ -28,68 +36,263 @@ from packages.provisioner.localstack_adapter import (
     terminate_resource,
 )
 
+pytestmark = pytest.mark.unit
+
+
+# Narrow specs: only the client and session methods the adapter calls, so a
+# misspelled method raises AttributeError instead of returning a new mock.
+_EC2_SPEC = [
+    "authorize_security_group_ingress",
+    "create_security_group",
+    "create_subnet",
+    "create_volume",
+    "create_vpc",
+    "delete_security_group",
+    "delete_subnet",
+    "delete_volume",
+    "delete_vpc",
+    "describe_instances",
+    "describe_security_groups",
+    "describe_subnets",
+    "describe_volumes",
+    "describe_vpcs",
+    "run_instances",
+    "start_instances",
+    "stop_instances",
+    "terminate_instances",
+]
+_ECS_SPEC = [
+    "create_cluster",
+    "create_service",
+    "delete_cluster",
+    "delete_service",
+    "describe_clusters",
+    "describe_services",
+    "register_task_definition",
+    "update_service",
+]
+_SESSION_SPEC = ["add_all", "commit", "execute", "query", "rollback"]
+
+# Fixed IDs: the adapter only passes them through, so no test needs a fresh uuid4().
+PROVISION_ID = "00000000-0000-0000-0000-000000000001"
+RESOURCE_IDS = (
+    "00000000-0000-0000-0000-000000000101",
+    "00000000-0000-0000-0000-000000000102",
+    "00000000-0000-0000-0000-000000000103",
+)
+RESOURCE_ID = RESOURCE_IDS[0]
+
+# Canned boto3 responses, built once per module run and shared read-only.
+RUN_INSTANCES_2 = MappingProxyType(
+    {
+        "Instances": (
+            MappingProxyType(
+                {
+                    "InstanceId": "i-12345",
+                    "State": {"Name": "running"},
+                    "PrivateIpAddress": "10.0.1.10",
+                    "PublicIpAddress": "54.1.2.3",
+                }
+            ),
+            MappingProxyType(
+                {
+                    "InstanceId": "i-67890",
+                    "State": {"Name": "running"},
+                    "PrivateIpAddress": "10.0.1.11",
+                    "PublicIpAddress": "54.1.2.4",
+                }
+            ),
+        )
+    }
+)
+CREATE_VOLUMES_GP3 = (
+    MappingProxyType(
+        {"VolumeId": "vol-12345", "Size": 100, "VolumeType": "gp3", "State": "available"}
+    ),
+    MappingProxyType(
+        {"VolumeId": "vol-67890", "Size": 100, "VolumeType": "gp3", "State": "available"}
+    ),
+)
+CREATE_VOLUME_IO2 = MappingProxyType(
+    {
+        "VolumeId": "vol-12345",
+        "Size": 500,
+        "VolumeType": "io2",
+        "State": "available",
+        "Iops": 20000,
+    }
+)
+CREATE_VPC = MappingProxyType({"Vpc": {"VpcId": "vpc-12345"}})
+CREATE_SUBNET = MappingProxyType({"Subnet": {"SubnetId": "subnet-12345"}})
+CREATE_SECURITY_GROUP = MappingProxyType({"GroupId": "sg-12345"})
+CREATE_CLUSTER = MappingProxyType(
+    {"cluster": {"clusterArn": "arn:aws:ecs:us-east-1:123456789:cluster/test"}}
+)
+REGISTER_TASK_DEFINITION = MappingProxyType(
+    {
+        "taskDefinition": {
+            "taskDefinitionArn": "arn:aws:ecs:us-east-1:123456789:task-definition/test:1"
+        }
+    }
+)
+CREATE_SERVICE = MappingProxyType(
+    {"service": {"serviceArn": "arn:aws:ecs:us-east-1:123456789:service/test"}}
+)
 
-def test_select_instance_type_small():
-    """Test instance type selection for small requirements."""
-    instance_type = _select_instance_type(cpu_cores=2, memory_gb=4)
-    assert instance_type == "t2.small"
+
+def _assert_persisted(session, adds=0, inserts=0, commits=1, rollbacks=0):
+    """Assert the rows a mock session received and how it was finished.
+
+    ``adds`` counts ORM objects passed to one add_all; ``inserts`` counts rows
+    passed to one Core INSERT into the resources table.
+    """
+    if adds:
+        session.add_all.assert_called_once()
+        assert len(session.add_all.call_args.args[0]) == adds
+    else:
+        session.add_all.assert_not_called()
+    if inserts:
+        session.execute.assert_called_once()
+        statement, rows = session.execute.call_args.args
+        assert statement.table is models.ResourceModel.__table__
+        assert len(rows) == inserts
+    else:
+        session.execute.assert_not_called()
+    assert session.commit.call_count == commits
+    assert session.rollback.call_count == rollbacks
+
+
+def _expected_task_definition(image_url, cpu, memory, environment):
+    """Return the register_task_definition kwargs expected for one container."""
+    return {
+        "family": ANY,
+        "networkMode": "awsvpc",
+        "requiresCompatibilities": ["FARGATE"],
+        "cpu": cpu,
+        "memory": memory,
+        "containerDefinitions": [
+            {
+                "name": ANY,
+                "image": image_url,
+                "cpu": int(cpu),
+                "memory": int(memory),
+                "essential": True,
+                "environment": environment,
+                "portMappings": ANY,
+            }
+        ],
+        "tags": ANY,
+    }
+
+
+@pytest.fixture(scope="module")
+def _boto3_client_slot():
+    """Patch _get_boto3_client once per module; tests swap the client it returns."""
+    slot = {}
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(localstack_adapter, "_get_boto3_client", lambda *args, **kwargs: slot["client"])
+        yield slot
+
+
+@pytest.fixture
+def mock_ec2(_boto3_client_slot):
+    """Return a fresh EC2 client mock served by the patched _get_boto3_client."""
+    _boto3_client_slot["client"] = Mock(spec=_EC2_SPEC)
+    return _boto3_client_slot["client"]
+
+
+@pytest.fixture
+def mock_ecs(_boto3_client_slot):
+    """Return a fresh ECS client mock served by the patched _get_boto3_client."""
+    _boto3_client_slot["client"] = Mock(spec=_ECS_SPEC)
+    return _boto3_client_slot["client"]
 
 
-def test_select_instance_type_medium():
-    """Test instance type selection for medium requirements."""
-    instance_type = _select_instance_type(cpu_cores=2, memory_gb=8)
-    assert instance_type == "t2.medium"
+@pytest.fixture(scope="module")
+def provision_id():
+    """Provision ID shared by the create/deploy tests; every session is a mock."""
+    return PROVISION_ID
 
 
-def test_select_instance_type_xlarge():
-    """Test instance type selection for xlarge requirements."""
-    instance_type = _select_instance_type(cpu_cores=4, memory_gb=16)
-    assert instance_type == "t2.xlarge"
+@pytest.fixture(scope="module")
+def compute_spec():
+    """Two t2.xlarge-sized instances (read-only, shared by the module)."""
+    return ComputeSpec(cpu_cores=4, memory_gb=16, instance_count=2)
 
 
-def test_select_instance_type_2xlarge():
-    """Test instance type selection for 2xlarge requirements."""
-    instance_type = _select_instance_type(cpu_cores=8, memory_gb=32)
-    assert instance_type == "m5.2xlarge"
+@pytest.fixture(scope="module")
+def storage_spec():
+    """100 GB gp3-backed SSD volumes at 3000 IOPS (read-only, shared by the module)."""
+    return StorageSpec(storage_type="ssd", capacity_gb=100, iops=3000)
 
 
-def test_select_instance_type_4xlarge():
-    """Test instance type selection for 4xlarge requirements."""
-    instance_type = _select_instance_type(cpu_cores=16, memory_gb=64)
-    assert instance_type == "m5.4xlarge"
+@pytest.fixture(scope="module")
+def network_spec():
+    """Network specification (read-only, shared by the module)."""
+    return NetworkSpec(bandwidth_mbps=1000, monthly_data_transfer_gb=5000)
 
 
-def test_select_instance_type_8xlarge():
-    """Test instance type selection for large requirements."""
-    instance_type = _select_instance_type(cpu_cores=32, memory_gb=128)
-    assert instance_type == "m5.8xlarge"
+@pytest.mark.parametrize(
+    "cpu_cores, memory_gb, expected",
+    [
+        (2, 4, "t2.small"),
+        (2, 8, "t2.medium"),
+        (4, 16, "t2.xlarge"),
+        (8, 32, "m5.2xlarge"),
+        (16, 64, "m5.4xlarge"),
+        (32, 128, "m5.8xlarge"),
+    ],
+    ids=["small", "medium", "xlarge", "2xlarge", "4xlarge", "8xlarge"],
+)
+def test_select_instance_type(cpu_cores, memory_gb, expected):
+    """Test instance type selection for CPU and memory requirements."""
+    assert _select_instance_type(cpu_cores=cpu_cores, memory_gb=memory_gb) == expected
+
+
+@pytest.mark.parametrize(
+    "storage_type, iops, expected",
+    [
+        ("nvme", None, "io2"),
+        ("ssd", 20000, "io2"),
+        ("ssd", None, "gp3"),
+        ("hdd", None, "st1"),
+    ],
+    ids=["nvme", "high_iops", "ssd", "hdd"],
+)
+def test_select_volume_type(storage_type, iops, expected):
+    """Test volume type selection for storage type and IOPS requirements."""
+    assert _select_volume_type(storage_type=storage_type, iops=iops) == expected
 
 
-def test_select_volume_type_nvme():
-    """Test volume type selection for NVMe storage."""
-    volume_type = _select_volume_type(storage_type="nvme", iops=None)
-    assert volume_type == "io2"
+def test_selectors_are_memoized():
+    """Test that repeated selector calls are served from the cache."""
+    _select_instance_type.cache_clear()
+    _select_volume_type.cache_clear()
 
+    for _ in range(2):
+        _select_instance_type(cpu_cores=8, memory_gb=32)
+        _select_volume_type(storage_type="ssd", iops=None)
 
-def test_select_volume_type_high_iops():
-    """Test volume type selection for high IOPS requirements."""
-    volume_type = _select_volume_type(storage_type="ssd", iops=20000)
-    assert volume_type == "io2"
+    assert _select_instance_type.cache_info().hits == 1
+    assert _select_volume_type.cache_info().hits == 1
 
 
-def test_select_volume_type_ssd():
-    """Test volume type selection for SSD storage."""
-    volume_type = _select_volume_type(storage_type="ssd", iops=None)
-    assert volume_type == "gp3"
+@pytest.mark.benchmark
+def test_select_instance_type_perf(benchmark):
+    """Benchmark instance type selection on the provisioning hot path."""
+    assert benchmark(_select_instance_type, 8, 32) == "m5.2xlarge"
 
 
-def test_select_volume_type_hdd():
-    """Test volume type selection for HDD storage."""
-    volume_type = _select_volume_type(storage_type="hdd", iops=None)
-    assert volume_type == "st1"
+@pytest.fixture
+def mock_boto3_client(monkeypatch):
+    """Patch boto3.client with an empty client cache, clearing it again afterwards."""
+    mock_client_factory = Mock()
+    monkeypatch.setattr(localstack_adapter.boto3, "client", mock_client_factory)
+    localstack_adapter._build_boto3_client.cache_clear()
+    yield mock_client_factory
+    localstack_adapter._build_boto3_client.cache_clear()
 
 
-@patch("packages.provisioner.localstack_adapter.boto3.client")
 def test_get_boto3_client(mock_boto3_client):
     """Test boto3 client creation for LocalStack."""
     _get_boto3_client("ec2", "http://localhost:4566")
@@ -100,136 +303,94 @@ def test_get_boto3_client(mock_boto3_client):
         region_name="us-east-1",
         aws_access_key_id="test",
         aws_secret_access_key="test",
+        config=ANY,
     )
+    config = mock_boto3_client.call_args.kwargs["config"]
+    assert config.max_pool_connections == 50
+    assert config.tcp_keepalive is True
+    assert config.retries == {"mode": "standard", "max_attempts": 3}
 
 
-@pytest.mark.asyncio
-@patch("packages.provisioner.localstack_adapter._get_boto3_client")
-async def test_create_ec2_instance_success(mock_get_client):
-    """Test successful EC2 instance creation."""
-    provision_id = str(uuid.uuid4())
-    spec = ComputeSpec(cpu_cores=4, memory_gb=16, instance_count=2)
+def test_get_boto3_client_is_cached_per_endpoint(mock_boto3_client, monkeypatch):
+    """Test that clients are reused per service and resolved endpoint."""
+    monkeypatch.setenv("LOCALSTACK_ENDPOINT", "http://localstack:4566")
 
-    # Mock EC2 client
-    mock_ec2 = MagicMock()
-    mock_get_client.return_value = mock_ec2
+    first = _get_boto3_client("ec2")
+    assert _get_boto3_client("ec2", "http://localstack:4566") is first
+    _get_boto3_client("ecs")
+    _get_boto3_client("ec2", "http://localhost:4566")
+
+    assert mock_boto3_client.call_count == 3
 
-    mock_ec2.run_instances.return_value = {
-        "Instances": [
-            {
-                "InstanceId": "i-12345",
-                "State": {"Name": "running"},
-                "PrivateIpAddress": "10.0.1.10",
-                "PublicIpAddress": "54.1.2.3",
-            },
-            {
-                "InstanceId": "i-67890",
-                "State": {"Name": "running"},
-                "PrivateIpAddress": "10.0.1.11",
-                "PublicIpAddress": "54.1.2.4",
-            },
-        ]
-    }
+
+async def test_create_ec2_instance_success(mock_ec2, provision_id, compute_spec):
+    """Test successful EC2 instance creation."""
+    mock_ec2.run_instances.return_value = RUN_INSTANCES_2
 
     # Mock database session
-    mock_session = MagicMock()
+    mock_session = Mock(spec=_SESSION_SPEC)
 
-    result = await create_ec2_instance(spec, provision_id, mock_session)
+    result = await create_ec2_instance(compute_spec, provision_id, mock_session)
 
-    assert len(result) == 2
-    assert result[0].instance_id == "i-12345"
-    assert result[0].instance_type == "t2.xlarge"
-    assert result[0].state == "running"
-    assert result[0].public_ip == "54.1.2.3"
-    assert result[1].instance_id == "i-67890"
+    assert result == [
+        EC2Instance("i-12345", "t2.xlarge", "running", "54.1.2.3", "10.0.1.10"),
+        EC2Instance("i-67890", "t2.xlarge", "running", "54.1.2.4", "10.0.1.11"),
+    ]
+    # A retried launch must reuse the same idempotency token
+    mock_ec2.run_instances.assert_called_once_with(
+        ImageId=ANY,
+        InstanceType="t2.xlarge",
+        MinCount=2,
+        MaxCount=2,
+        ClientToken=f"hybrid-cloud-{provision_id}",
+        TagSpecifications=ANY,
+    )
 
     # Verify database operations
-    assert mock_session.add.call_count == 2
-    mock_session.commit.assert_called_once()
+    _assert_persisted(mock_session, inserts=2)
 
 
-@pytest.mark.asyncio
-@patch("packages.provisioner.localstack_adapter._get_boto3_client")
-async def test_create_ec2_instance_failure(mock_get_client):
+async def test_create_ec2_instance_failure(mock_ec2, provision_id, compute_spec):
     """Test EC2 instance creation failure."""
-    provision_id = str(uuid.uuid4())
-    spec = ComputeSpec(cpu_cores=4, memory_gb=16, instance_count=1)
-
-    # Mock EC2 client to raise exception
-    mock_ec2 = MagicMock()
-    mock_get_client.return_value = mock_ec2
     mock_ec2.run_instances.side_effect = Exception("AWS API error")
 
-    mock_session = MagicMock()
+    mock_session = Mock(spec=_SESSION_SPEC)
 
     with pytest.raises(RuntimeError, match="Failed to create EC2 instances"):
-        await create_ec2_instance(spec, provision_id, mock_session)
+        await create_ec2_instance(compute_spec, provision_id, mock_session)
 
-    # Verify rollback was called
-    mock_session.rollback.assert_called_once()
+    _assert_persisted(mock_session, commits=0, rollbacks=1)
 
 
-@pytest.mark.asyncio
-@patch("packages.provisioner.localstack_adapter._get_boto3_client")
-async def test_create_ebs_volume_success(mock_get_client):
+async def test_create_ebs_volume_success(mock_ec2, provision_id, storage_spec):
     """Test successful EBS volume creation."""
-    provision_id = str(uuid.uuid4())
-    spec = StorageSpec(storage_type="ssd", capacity_gb=100, iops=3000)
-
-    # Mock EC2 client
-    mock_ec2 = MagicMock()
-    mock_get_client.return_value = mock_ec2
-
-    mock_ec2.create_volume.side_effect = [
-        {
-            "VolumeId": "vol-12345",
-            "Size": 100,
-            "VolumeType": "gp3",
-            "State": "available",
-        },
-        {
-            "VolumeId": "vol-67890",
-            "Size": 100,
-            "VolumeType": "gp3",
-            "State": "available",
-        },
+    # Volumes are created concurrently; answer by the index in the Name tag
+    mock_ec2.create_volume.side_effect = lambda **params: CREATE_VOLUMES_GP3[
+        int(params["TagSpecifications"][0]["Tags"][0]["Value"].rsplit("-", 1)[1])
     ]
 
-    mock_session = MagicMock()
+    mock_session = Mock(spec=_SESSION_SPEC)
 
-    result = await create_ebs_volume(spec, 2, provision_id, mock_session)
+    result = await create_ebs_volume(storage_spec, 2, provision_id, mock_session)
 
     assert len(result) == 2
-    assert result[0].volume_id == "vol-12345"
+    assert [volume.volume_id for volume in result] == ["vol-12345", "vol-67890"]
     assert result[0].size_gb == 100
     assert result[0].volume_type == "gp3"
     assert result[0].state == "available"
     assert result[0].iops == 3000
 
     # Verify database operations
-    assert mock_session.add.call_count == 2
-    mock_session.commit.assert_called_once()
+    _assert_persisted(mock_session, inserts=2)
 
 
-@pytest.mark.asyncio
-@patch("packages.provisioner.localstack_adapter._get_boto3_client")
-async def test_create_ebs_volume_with_high_iops(mock_get_client):
+async def test_create_ebs_volume_with_high_iops(mock_ec2, provision_id):
     """Test EBS volume creation with high IOPS."""
-    provision_id = str(uuid.uuid4())
     spec = StorageSpec(storage_type="nvme", capacity_gb=500, iops=20000)
 
-    mock_ec2 = MagicMock()
-    mock_get_client.return_value = mock_ec2
-
-    mock_ec2.create_volume.return_value = {
-        "VolumeId": "vol-12345",
-        "Size": 500,
-        "VolumeType": "io2",
-        "State": "available",
-        "Iops": 20000,
-    }
+    mock_ec2.create_volume.return_value = CREATE_VOLUME_IO2
 
-    mock_session = MagicMock()
+    mock_session = Mock(spec=_SESSION_SPEC)
 
     result = await create_ebs_volume(spec, 1, provision_id, mock_session)
 
@@ -238,182 +399,220 @@ async def test_create_ebs_volume_with_high_iops(mock_get_client):
     assert result[0].iops == 20000
 
     # Verify IOPS was included in the create_volume call
-    call_args = mock_ec2.create_volume.call_args[1]
-    assert call_args["Iops"] == 20000
+    mock_ec2.create_volume.assert_called_once_with(
+        AvailabilityZone=ANY, Size=500, VolumeType="io2", Iops=20000, TagSpecifications=ANY
+    )
 
 
-@pytest.mark.asyncio
-@patch("packages.provisioner.localstack_adapter._get_boto3_client")
-async def test_create_ebs_volume_failure(mock_get_client):
+async def test_create_ebs_volume_failure(mock_ec2, provision_id):
     """Test EBS volume creation failure."""
-    provision_id = str(uuid.uuid4())
     spec = StorageSpec(storage_type="ssd", capacity_gb=100, iops=None)
 
-    mock_ec2 = MagicMock()
-    mock_get_client.return_value = mock_ec2
     mock_ec2.create_volume.side_effect = Exception("Volume creation failed")
 
-    mock_session = MagicMock()
+    mock_session = Mock(spec=_SESSION_SPEC)
 
     with pytest.raises(RuntimeError, match="Failed to create EBS volumes"):
         await create_ebs_volume(spec, 1, provision_id, mock_session)
 
-    mock_session.rollback.assert_called_once()
+    _assert_persisted(mock_session, commits=0, rollbacks=1)
 
 
-@pytest.mark.asyncio
-@patch("packages.provisioner.localstack_adapter._get_boto3_client")
-async def test_configure_networking_success(mock_get_client):
-    """Test successful VPC and networking configuration."""
-    provision_id = str(uuid.uuid4())
-    spec = NetworkSpec(bandwidth_mbps=1000, monthly_data_transfer_gb=5000)
+async def test_create_ebs_volume_partial_failure_deletes_created(
+    mock_ec2, provision_id, storage_spec
+):
+    """Test that volumes created alongside a failed call are deleted, not orphaned."""
+
+    def create_volume(**params):
+        if params["TagSpecifications"][0]["Tags"][0]["Value"].endswith("-1"):
+            raise Exception("Volume creation failed")
+        return CREATE_VOLUMES_GP3[0]
+
+    mock_ec2.create_volume.side_effect = create_volume
+
+    mock_session = Mock(spec=_SESSION_SPEC)
+
+    with pytest.raises(RuntimeError, match="Failed to create EBS volumes"):
+        await create_ebs_volume(storage_spec, 2, provision_id, mock_session)
+
+    assert mock_ec2.create_volume.call_count == 2
+    mock_ec2.delete_volume.assert_called_once_with(VolumeId="vol-12345")
+    _assert_persisted(mock_session, commits=0, rollbacks=1)
+
+
+async def test_create_ebs_volume_reports_undeleted_orphans(
+    mock_ec2, provision_id, storage_spec, caplog
+):
+    """Test that an orphaned volume that cannot be deleted is logged and noted on the error."""
+
+    def create_volume(**params):
+        if params["TagSpecifications"][0]["Tags"][0]["Value"].endswith("-1"):
+            raise Exception("Volume creation failed")
+        return CREATE_VOLUMES_GP3[0]
+
+    mock_ec2.create_volume.side_effect = create_volume
+    mock_ec2.delete_volume.side_effect = Exception("Delete failed")
+
+    with pytest.raises(RuntimeError, match="Failed to create EBS volumes") as exc_info:
+        await create_ebs_volume(storage_spec, 2, provision_id, Mock(spec=_SESSION_SPEC))
+
+    assert exc_info.value.__cause__.__notes__ == [
+        "Orphaned volumes could not be deleted: vol-12345"
+    ]
+    assert "Failed to delete orphaned volume vol-12345" in caplog.text
+
 
-    # Mock EC2 client
-    mock_ec2 = MagicMock()
-    mock_get_client.return_value = mock_ec2
+async def test_create_ebs_volume_bounds_concurrency(mock_ec2, provision_id, storage_spec):
+    """Test that no more than MAX_CONCURRENT_VOLUME_CALLS volumes are created at once."""
+    lock = threading.Lock()
+    in_flight = peak = 0
 
-    mock_ec2.create_vpc.return_value = {"Vpc": {"VpcId": "vpc-12345"}}
-    mock_ec2.create_subnet.return_value = {"Subnet": {"SubnetId": "subnet-12345"}}
-    mock_ec2.create_security_group.return_value = {"GroupId": "sg-12345"}
+    def create_volume(**params):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight -= 1
+        return CREATE_VOLUMES_GP3[0]
 
-    mock_session = MagicMock()
+    mock_ec2.create_volume.side_effect = create_volume
+    count = localstack_adapter.MAX_CONCURRENT_VOLUME_CALLS + 4
 
-    result = await configure_networking(spec, provision_id, mock_session)
+    result = await create_ebs_volume(storage_spec, count, provision_id, Mock(spec=_SESSION_SPEC))
 
-    assert result.vpc_id == "vpc-12345"
-    assert result.subnet_id == "subnet-12345"
-    assert result.security_group_id == "sg-12345"
-    assert result.cidr_block == "10.0.0.0/16"
+    assert len(result) == count
+    assert peak <= localstack_adapter.MAX_CONCURRENT_VOLUME_CALLS
+
+
+async def test_configure_networking_success(mock_ec2, provision_id, network_spec):
+    """Test successful VPC and networking configuration."""
+    mock_ec2.create_vpc.return_value = CREATE_VPC
+    mock_ec2.create_subnet.return_value = CREATE_SUBNET
+    mock_ec2.create_security_group.return_value = CREATE_SECURITY_GROUP
+
+    mock_session = Mock(spec=_SESSION_SPEC)
+
+    result = await configure_networking(network_spec, provision_id, mock_session)
+
+    assert result == NetworkConfig("vpc-12345", "subnet-12345", "sg-12345", "10.0.0.0/16")
 
     # Verify security group ingress rules were added
     mock_ec2.authorize_security_group_ingress.assert_called_once()
 
     # Verify database operations (VPC, subnet, security group)
-    assert mock_session.add.call_count == 3
-    mock_session.commit.assert_called_once()
+    _assert_persisted(mock_session, adds=3)
 
 
-@pytest.mark.asyncio
-@patch("packages.provisioner.localstack_adapter._get_boto3_client")
-async def test_configure_networking_failure(mock_get_client):
+async def test_configure_networking_failure(mock_ec2, provision_id, network_spec):
     """Test networking configuration failure."""
-    provision_id = str(uuid.uuid4())
-    spec = NetworkSpec(bandwidth_mbps=1000, monthly_data_transfer_gb=5000)
-
-    mock_ec2 = MagicMock()
-    mock_get_client.return_value = mock_ec2
     mock_ec2.create_vpc.side_effect = Exception("VPC creation failed")
 
-    mock_session = MagicMock()
+    mock_session = Mock(spec=_SESSION_SPEC)
 
     with pytest.raises(RuntimeError, match="Failed to configure networking"):
-        await configure_networking(spec, provision_id, mock_session)
+        await configure_networking(network_spec, provision_id, mock_session)
 
-    mock_session.rollback.assert_called_once()
+    _assert_persisted(mock_session, commits=0, rollbacks=1)
 
 
-@pytest.mark.asyncio
-@patch("packages.provisioner.localstack_adapter._get_boto3_client")
-async def test_deploy_to_ecs_success(mock_get_client):
+async def test_deploy_to_ecs_success(mock_ecs, provision_id):
     """Test successful ECS deployment."""
-    provision_id = str(uuid.uuid4())
     image_url = "nginx:latest"
     cpu_cores = 2
     memory_gb = 4
     env_vars = {"ENV": "production", "DEBUG": "false"}
 
-    # Mock ECS client
-    mock_ecs = MagicMock()
-    mock_get_client.return_value = mock_ecs
+    mock_ecs.create_cluster.return_value = CREATE_CLUSTER
+    mock_ecs.register_task_definition.return_value = REGISTER_TASK_DEFINITION
+    mock_ecs.create_service.return_value = CREATE_SERVICE
 
-    mock_ecs.create_cluster.return_value = {
-        "cluster": {"clusterArn": "arn:aws:ecs:us-east-1:123456789:cluster/test"}
-    }
-    mock_ecs.register_task_definition.return_value = {
-        "taskDefinition": {
-            "taskDefinitionArn": "arn:aws:ecs:us-east-1:123456789:task-definition/test:1"
-        }
-    }
-    mock_ecs.create_service.return_value = {
-        "service": {"serviceArn": "arn:aws:ecs:us-east-1:123456789:service/test"}
-    }
-
-    mock_session = MagicMock()
+    mock_session = Mock(spec=_SESSION_SPEC)
 
     result = await deploy_to_ecs(
         image_url, cpu_cores, memory_gb, provision_id, mock_session, env_vars
     )
 
-    assert "cluster" in result.cluster_arn
-    assert "service" in result.service_arn
-    assert "task-definition" in result.task_definition_arn
-    assert result.endpoint == "http://localhost:8080"
-
-    # Verify task definition includes environment variables
-    task_def_call = mock_ecs.register_task_definition.call_args[1]
-    container_def = task_def_call["containerDefinitions"][0]
-    assert len(container_def["environment"]) == 2
-    assert {"name": "ENV", "value": "production"} in container_def["environment"]
-    assert {"name": "DEBUG", "value": "false"} in container_def["environment"]
+    assert result == ECSDeployment(
+        cluster_arn=CREATE_CLUSTER["cluster"]["clusterArn"],
+        service_arn=CREATE_SERVICE["service"]["serviceArn"],
+        task_definition_arn=REGISTER_TASK_DEFINITION["taskDefinition"]["taskDefinitionArn"],
+        endpoint="http://localhost:8080",
+    )
 
-    # Verify CPU and memory are correctly converted
-    assert task_def_call["cpu"] == "2048"  # 2 cores * 1024
-    assert task_def_call["memory"] == "4096"  # 4 GB * 1024
+    # Verify CPU and memory conversion (1024 units per core / GB) and environment
+    mock_ecs.register_task_definition.assert_called_once_with(
+        **_expected_task_definition(
+            image_url,
+            "2048",
+            "4096",
+            [{"name": "ENV", "value": "production"}, {"name": "DEBUG", "value": "false"}],
+        )
+    )
 
     # Verify database operations (cluster and service)
-    assert mock_session.add.call_count == 2
-    mock_session.commit.assert_called_once()
+    _assert_persisted(mock_session, adds=2)
 
 
-@pytest.mark.asyncio
-@patch("packages.provisioner.localstack_adapter._get_boto3_client")
-async def test_deploy_to_ecs_without_env_vars(mock_get_client):
+async def test_deploy_to_ecs_without_env_vars(mock_ecs, provision_id):
     """Test ECS deployment without environment variables."""
-    provision_id = str(uuid.uuid4())
     image_url = "nginx:latest"
 
-    mock_ecs = MagicMock()
-    mock_get_client.return_value = mock_ecs
-
-    mock_ecs.create_cluster.return_value = {
-        "cluster": {"clusterArn": "arn:aws:ecs:us-east-1:123456789:cluster/test"}
-    }
-    mock_ecs.register_task_definition.return_value = {
-        "taskDefinition": {
-            "taskDefinitionArn": "arn:aws:ecs:us-east-1:123456789:task-definition/test:1"
-        }
-    }
-    mock_ecs.create_service.return_value = {
-        "service": {"serviceArn": "arn:aws:ecs:us-east-1:123456789:service/test"}
-    }
+    mock_ecs.create_cluster.return_value = CREATE_CLUSTER
+    mock_ecs.register_task_definition.return_value = REGISTER_TASK_DEFINITION
+    mock_ecs.create_service.return_value = CREATE_SERVICE
 
-    mock_session = MagicMock()
+    mock_session = Mock(spec=_SESSION_SPEC)
 
     await deploy_to_ecs(image_url, 1, 2, provision_id, mock_session)
 
     # Verify task definition has empty environment list
-    task_def_call = mock_ecs.register_task_definition.call_args[1]
-    container_def = task_def_call["containerDefinitions"][0]
-    assert container_def["environment"] == []
+    mock_ecs.register_task_definition.assert_called_once_with(
+        **_expected_task_definition(image_url, "1024", "2048", [])
+    )
+
+
 
+@pytest.mark.parametrize(
+    "network_kwargs, expected_awsvpc",
+    [
+        ({}, {"subnets": ["subnet-12345"], "securityGroups": []}),
+        (
+            {"subnet_id": "subnet-abc", "security_group_id": "sg-abc"},
+            {"subnets": ["subnet-abc"], "securityGroups": ["sg-abc"]},
+        ),
+    ],
+    ids=["placeholder", "provisioned"],
+)
+async def test_deploy_to_ecs_network_configuration(
+    mock_ecs, provision_id, network_kwargs, expected_awsvpc
+):
+    """Test that the service runs in the given subnet and security group."""
+    mock_ecs.create_cluster.return_value = CREATE_CLUSTER
+    mock_ecs.register_task_definition.return_value = REGISTER_TASK_DEFINITION
+    mock_ecs.create_service.return_value = CREATE_SERVICE
+
+    await deploy_to_ecs(
+        "nginx:latest", 1, 2, provision_id, Mock(spec=_SESSION_SPEC), **network_kwargs
+    )
 
-@pytest.mark.asyncio
-@patch("packages.provisioner.localstack_adapter._get_boto3_client")
-async def test_deploy_to_ecs_failure(mock_get_client):
+    network = mock_ecs.create_service.call_args.kwargs["networkConfiguration"]
+    assert network["awsvpcConfiguration"] == {**expected_awsvpc, "assignPublicIp": "ENABLED"}
+
+
+async def test_deploy_to_ecs_failure(mock_ecs, provision_id):
     """Test ECS deployment failure."""
-    provision_id = str(uuid.uuid4())
     image_url = "nginx:latest"
 
-    mock_ecs = MagicMock()
-    mock_get_client.return_value = mock_ecs
     mock_ecs.create_cluster.side_effect = Exception("Cluster creation failed")
 
-    mock_session = MagicMock()
+    mock_session = Mock(spec=_SESSION_SPEC)
 
     with pytest.raises(RuntimeError, match="Failed to deploy to ECS"):
         await deploy_to_ecs(image_url, 2, 4, provision_id, mock_session)
 
-    mock_session.rollback.assert_called_once()
+    _assert_persisted(mock_session, commits=0, rollbacks=1)
 
 
 def test_resource_status_enum():
@@ -425,95 +624,109 @@ def test_resource_status_enum():
     assert ResourceStatus.ERROR.value == "error"
 
 
-def test_ec2_instance_dataclass():
-    """Test EC2Instance dataclass creation."""
-    instance = EC2Instance(
-        instance_id="i-12345",
-        instance_type="t2.micro",
-        state="running",
-        public_ip="54.1.2.3",
-        private_ip="10.0.1.10",
-    )
-
-    assert instance.instance_id == "i-12345"
-    assert instance.instance_type == "t2.micro"
-    assert instance.state == "running"
-    assert instance.public_ip == "54.1.2.3"
-    assert instance.private_ip == "10.0.1.10"
-
-
-def test_ebs_volume_dataclass():
-    """Test EBSVolume dataclass creation."""
-    volume = EBSVolume(
-        volume_id="vol-12345",
-        size_gb=100,
-        volume_type="gp3",
-        state="available",
-        iops=3000,
-    )
-
-    assert volume.volume_id == "vol-12345"
-    assert volume.size_gb == 100
-    assert volume.volume_type == "gp3"
-    assert volume.state == "available"
-    assert volume.iops == 3000
-
-
-def test_network_config_dataclass():
-    """Test NetworkConfig dataclass creation."""
-    config = NetworkConfig(
-        vpc_id="vpc-12345",
-        subnet_id="subnet-12345",
-        security_group_id="sg-12345",
-        cidr_block="10.0.0.0/16",
-    )
-
-    assert config.vpc_id == "vpc-12345"
-    assert config.subnet_id == "subnet-12345"
-    assert config.security_group_id == "sg-12345"
-    assert config.cidr_block == "10.0.0.0/16"
-
-
-def test_ecs_deployment_dataclass():
-    """Test ECSDeployment dataclass creation."""
-    deployment = ECSDeployment(
-        cluster_arn="arn:aws:ecs:us-east-1:123456789:cluster/test",
-        service_arn="arn:aws:ecs:us-east-1:123456789:service/test",
-        task_definition_arn="arn:aws:ecs:us-east-1:123456789:task-definition/test:1",
-        endpoint="http://localhost:8080",
-    )
-
-    assert "cluster" in deployment.cluster_arn
-    assert "service" in deployment.service_arn
-    assert "task-definition" in deployment.task_definition_arn
-    assert deployment.endpoint == "http://localhost:8080"
-
+@pytest.mark.parametrize(
+    "dataclass_type, fields",
+    [
+        (
+            EC2Instance,
+            {
+                "instance_id": "i-12345",
+                "instance_type": "t2.micro",
+                "state": "running",
+                "public_ip": "54.1.2.3",
+                "private_ip": "10.0.1.10",
+            },
+        ),
+        (
+            EBSVolume,
+            {
+                "volume_id": "vol-12345",
+                "size_gb": 100,
+                "volume_type": "gp3",
+                "state": "available",
+                "iops": 3000,
+            },
+        ),
+        (
+            NetworkConfig,
+            {
+                "vpc_id": "vpc-12345",
+                "subnet_id": "subnet-12345",
+                "security_group_id": "sg-12345",
+                "cidr_block": "10.0.0.0/16",
+            },
+        ),
+        (
+            ECSDeployment,
+            {
+                "cluster_arn": "arn:aws:ecs:us-east-1:123456789:cluster/test",
+                "service_arn": "arn:aws:ecs:us-east-1:123456789:service/test",
+                "task_definition_arn": "arn:aws:ecs:us-east-1:123456789:task-definition/test:1",
+                "endpoint": "http://localhost:8080",
+            },
+        ),
+        (
+            ResourceState,
+            {
+                "resource_id": "res-12345",
+                "resource_type": "ec2_instance",
+                "external_id": "i-12345",
+                "status": "running",
+                "details": {"instance_type": "t2.micro", "public_ip": "54.1.2.3"},
+            },
+        ),
+    ],
+    ids=["ec2_instance", "ebs_volume", "network_config", "ecs_deployment", "resource_state"],
+)
+def test_dataclass_creation(dataclass_type, fields):
+    """Test that result dataclasses keep every field in declaration order."""
+    assert astuple(dataclass_type(**fields)) == tuple(fields.values())
+
+
+# run_instances entries as LocalStack returns them; the IP addresses are optional
+_INSTANCE_DATA = st.fixed_dictionaries(
+    {
+        "InstanceId": st.from_regex(r"i-[0-9a-f]{8,17}", fullmatch=True),
+        "State": st.fixed_dictionaries({"Name": st.sampled_from(["pending", "running"])}),
+    },
+    optional={
+        "PrivateIpAddress": st.ip_addresses(v=4).map(str),
+        "PublicIpAddress": st.ip_addresses(v=4).map(str),
+    },
+)
 
-def test_resource_state_dataclass():
-    """Test ResourceState dataclass creation."""
-    state = ResourceState(
-        resource_id="res-12345",
-        resource_type="ec2_instance",
-        external_id="i-12345",
-        status="running",
-        details={"instance_type": "t2.micro", "public_ip": "54.1.2.3"},
-    )
 
-    assert state.resource_id == "res-12345"
-    assert state.resource_type == "ec2_instance"
-    assert state.external_id == "i-12345"
-    assert state.status == "running"
-    assert state.details["instance_type"] == "t2.micro"
+@given(instances=st.lists(_INSTANCE_DATA, min_size=1, max_size=5))
+def test_create_ec2_instance_maps_every_instance(_boto3_client_slot, instances):
+    """Test that create_ec2_instance returns one matching EC2Instance per launched instance."""
+    mock_ec2 = Mock(spec=_EC2_SPEC)
+    mock_ec2.run_instances.return_value = {"Instances": instances}
+    _boto3_client_slot["client"] = mock_ec2
+    mock_session = Mock(spec=_SESSION_SPEC)
+    spec = ComputeSpec(cpu_cores=2, memory_gb=4, instance_count=len(instances))
+
+    result = asyncio.run(create_ec2_instance(spec, PROVISION_ID, mock_session))
+
+    assert result == [
+        EC2Instance(
+            instance_id=data["InstanceId"],
+            instance_type="t2.small",
+            state=data["State"]["Name"],
+            public_ip=data.get("PublicIpAddress"),
+            private_ip=data.get("PrivateIpAddress"),
+        )
+        for data in instances
+    ]
+    _assert_persisted(mock_session, inserts=len(instances))
 
 
-@patch("packages.provisioner.localstack_adapter._get_boto3_client")
-def test_start_resource_ec2_instance(mock_get_client):
+def test_start_resource_ec2_instance(mock_ec2):
     """Test starting an EC2 instance."""
-    resource_id = str(uuid.uuid4())
+    resource_id = RESOURCE_ID
     external_id = "i-12345"
 
     # Mock database session and resource
-    mock_session = MagicMock()
+    mock_session = Mock(spec=_SESSION_SPEC)
     mock_resource = MagicMock()
     mock_resource.id = resource_id
     mock_resource.resource_type = "ec2_instance"
@@ -521,10 +734,6 @@ def test_start_resource_ec2_instance(mock_get_client):
     mock_resource.status = "stopped"
     mock_session.query.return_value.filter_by.return_value.first.return_value = mock_resource
 
-    # Mock EC2 client
-    mock_ec2 = MagicMock()
-    mock_get_client.return_value = mock_ec2
-
     result = start_resource(resource_id, mock_session)
 
     assert result.resource_id == resource_id
@@ -540,14 +749,13 @@ def test_start_resource_ec2_instance(mock_get_client):
     mock_session.commit.assert_called_once()
 
 
-@patch("packages.provisioner.localstack_adapter._get_boto3_client")
-def test_start_resource_ecs_service(mock_get_client):
+def test_start_resource_ecs_service(mock_ecs):
     """Test starting an ECS service."""
-    resource_id = str(uuid.uuid4())
+    resource_id = RESOURCE_ID
     external_id = "arn:aws:ecs:us-east-1:123456789:service/my-cluster/my-service"
 
     # Mock database session and resource
-    mock_session = MagicMock()
+    mock_session = Mock(spec=_SESSION_SPEC)
     mock_resource = MagicMock()
     mock_resource.id = resource_id
     mock_resource.resource_type = "ecs_service"
@@ -555,10 +763,6 @@ def test_start_resource_ecs_service(mock_get_client):
     mock_resource.status = "stopped"
     mock_session.query.return_value.filter_by.return_value.first.return_value = mock_resource
 
-    # Mock ECS client
-    mock_ecs = MagicMock()
-    mock_get_client.return_value = mock_ecs
-
     result = start_resource(resource_id, mock_session)
 
     assert result.resource_id == resource_id
@@ -566,39 +770,33 @@ def test_start_resource_ecs_service(mock_get_client):
     assert result.status == "running"
 
     # Verify ECS update_service was called with desiredCount=1
-    mock_ecs.update_service.assert_called_once()
-    call_args = mock_ecs.update_service.call_args[1]
-    assert call_args["desiredCount"] == 1
+    mock_ecs.update_service.assert_called_once_with(cluster=ANY, service=ANY, desiredCount=1)
 
 
 def test_start_resource_not_found():
     """Test starting a resource that doesn't exist in database."""
-    resource_id = str(uuid.uuid4())
+    resource_id = RESOURCE_ID
 
     # Mock database session with no resource found
-    mock_session = MagicMock()
+    mock_session = Mock(spec=_SESSION_SPEC)
     mock_session.query.return_value.filter_by.return_value.first.return_value = None
 
     with pytest.raises(ValueError, match="Resource .* not found in database"):
         start_resource(resource_id, mock_session)
 
 
-@patch("packages.provisioner.localstack_adapter._get_boto3_client")
-def test_start_resource_api_failure(mock_get_client):
+def test_start_resource_api_failure(mock_ec2):
     """Test starting a resource when AWS API fails."""
-    resource_id = str(uuid.uuid4())
+    resource_id = RESOURCE_ID
 
     # Mock database session and resource
-    mock_session = MagicMock()
+    mock_session = Mock(spec=_SESSION_SPEC)
     mock_resource = MagicMock()
     mock_resource.id = resource_id
     mock_resource.resource_type = "ec2_instance"
     mock_resource.external_id = "i-12345"
     mock_session.query.return_value.filter_by.return_value.first.return_value = mock_resource
 
-    # Mock EC2 client to raise exception
-    mock_ec2 = MagicMock()
-    mock_get_client.return_value = mock_ec2
     mock_ec2.start_instances.side_effect = Exception("API error")
 
     with pytest.raises(RuntimeError, match="Failed to start resource"):
@@ -608,14 +806,13 @@ def test_start_resource_api_failure(mock_get_client):
     mock_session.rollback.assert_called_once()
 
 
-@patch("packages.provisioner.localstack_adapter._get_boto3_client")
-def test_stop_resource_ec2_instance(mock_get_client):
+def test_stop_resource_ec2_instance(mock_ec2):
     """Test stopping an EC2 instance."""
-    resource_id = str(uuid.uuid4())
+    resource_id = RESOURCE_ID
     external_id = "i-12345"
 
     # Mock database session and resource
-    mock_session = MagicMock()
+    mock_session = Mock(spec=_SESSION_SPEC)
     mock_resource = MagicMock()
     mock_resource.id = resource_id
     mock_resource.resource_type = "ec2_instance"
@@ -623,10 +820,6 @@ def test_stop_resource_ec2_instance(mock_get_client):
     mock_resource.status = "running"
     mock_session.query.return_value.filter_by.return_value.first.return_value = mock_resource
 
-    # Mock EC2 client
-    mock_ec2 = MagicMock()
-    mock_get_client.return_value = mock_ec2
-
     result = stop_resource(resource_id, mock_session)
 
     assert result.resource_id == resource_id
@@ -642,14 +835,13 @@ def test_stop_resource_ec2_instance(mock_get_client):
     mock_session.commit.assert_called_once()
 
 
-@patch("packages.provisioner.localstack_adapter._get_boto3_client")
-def test_stop_resource_ecs_service(mock_get_client):
+def test_stop_resource_ecs_service(mock_ecs):
     """Test stopping an ECS service."""
-    resource_id = str(uuid.uuid4())
+    resource_id = RESOURCE_ID
     external_id = "arn:aws:ecs:us-east-1:123456789:service/my-cluster/my-service"
 
     # Mock database session and resource
-    mock_session = MagicMock()
+    mock_session = Mock(spec=_SESSION_SPEC)
     mock_resource = MagicMock()
     mock_resource.id = resource_id
     mock_resource.resource_type = "ecs_service"
@@ -657,10 +849,6 @@ def test_stop_resource_ecs_service(mock_get_client):
     mock_resource.status = "running"
     mock_session.query.return_value.filter_by.return_value.first.return_value = mock_resource
 
-    # Mock ECS client
-    mock_ecs = MagicMock()
-    mock_get_client.return_value = mock_ecs
-
     result = stop_resource(resource_id, mock_session)
 
     assert result.resource_id == resource_id
@@ -668,31 +856,28 @@ def test_stop_resource_ecs_service(mock_get_client):
     assert result.status == "stopped"
 
     # Verify ECS update_service was called with desiredCount=0
-    mock_ecs.update_service.assert_called_once()
-    call_args = mock_ecs.update_service.call_args[1]
-    assert call_args["desiredCount"] == 0
+    mock_ecs.update_service.assert_called_once_with(cluster=ANY, service=ANY, desiredCount=0)
 
 
 def test_stop_resource_not_found():
     """Test stopping a resource that doesn't exist in database."""
-    resource_id = str(uuid.uuid4())
+    resource_id = RESOURCE_ID
 
     # Mock database session with no resource found
-    mock_session = MagicMock()
+    mock_session = Mock(spec=_SESSION_SPEC)
     mock_session.query.return_value.filter_by.return_value.first.return_value = None
 
     with pytest.raises(ValueError, match="Resource .* not found in database"):
         stop_resource(resource_id, mock_session)
 
 
-@patch("packages.provisioner.localstack_adapter._get_boto3_client")
-def test_terminate_resource_ec2_instance(mock_get_client):
+def test_terminate_resource_ec2_instance(mock_ec2):
     """Test terminating an EC2 instance."""
-    resource_id = str(uuid.uuid4())
+    resource_id = RESOURCE_ID
     external_id = "i-12345"
 
     # Mock database session and resource
-    mock_session = MagicMock()
+    mock_session = Mock(spec=_SESSION_SPEC)
     mock_resource = MagicMock()
     mock_resource.id = resource_id
     mock_resource.resource_type = "ec2_instance"
@@ -700,10 +885,6 @@ def test_terminate_resource_ec2_instance(mock_get_client):
     mock_resource.status = "running"
     mock_session.query.return_value.filter_by.return_value.first.return_value = mock_resource
 
-    # Mock EC2 client
-    mock_ec2 = MagicMock()
-    mock_get_client.return_value = mock_ec2
-
     result = terminate_resource(resource_id, mock_session)
 
     assert result.resource_id == resource_id
@@ -719,14 +900,13 @@ def test_terminate_resource_ec2_instance(mock_get_client):
     mock_session.commit.assert_called_once()
 
 
-@patch("packages.provisioner.localstack_adapter._get_boto3_client")
-def test_terminate_resource_ecs_service(mock_get_client):
+def test_terminate_resource_ecs_service(mock_ecs):
     """Test terminating an ECS service."""
-    resource_id = str(uuid.uuid4())
+    resource_id = RESOURCE_ID
     external_id = "arn:aws:ecs:us-east-1:123456789:service/my-cluster/my-service"
 
     # Mock database session and resource
-    mock_session = MagicMock()
+    mock_session = Mock(spec=_SESSION_SPEC)
     mock_resource = MagicMock()
     mock_resource.id = resource_id
     mock_resource.resource_type = "ecs_service"
@@ -734,10 +914,6 @@ def test_terminate_resource_ecs_service(mock_get_client):
     mock_resource.status = "running"
     mock_session.query.return_value.filter_by.return_value.first.return_value = mock_resource
 
-    # Mock ECS client
-    mock_ecs = MagicMock()
-    mock_get_client.return_value = mock_ecs
-
     result = terminate_resource(resource_id, mock_session)
 
     assert result.resource_id == resource_id
@@ -745,19 +921,16 @@ def test_terminate_resource_ecs_service(mock_get_client):
     assert result.status == "terminated"
 
     # Verify ECS delete_service was called with force=True
-    mock_ecs.delete_service.assert_called_once()
-    call_args = mock_ecs.delete_service.call_args[1]
-    assert call_args["force"] is True
+    mock_ecs.delete_service.assert_called_once_with(cluster=ANY, service=ANY, force=True)
 
 
-@patch("packages.provisioner.localstack_adapter._get_boto3_client")
-def test_terminate_resource_ecs_cluster(mock_get_client):
+def test_terminate_resource_ecs_cluster(mock_ecs):
     """Test terminating an ECS cluster."""
-    resource_id = str(uuid.uuid4())
+    resource_id = RESOURCE_ID
     external_id = "arn:aws:ecs:us-east-1:123456789:cluster/my-cluster"
 
     # Mock database session and resource
-    mock_session = MagicMock()
+    mock_session = Mock(spec=_SESSION_SPEC)
     mock_resource = MagicMock()
     mock_resource.id = resource_id
     mock_resource.resource_type = "ecs_cluster"
@@ -765,10 +938,6 @@ def test_terminate_resource_ecs_cluster(mock_get_client):
     mock_resource.status = "active"
     mock_session.query.return_value.filter_by.return_value.first.return_value = mock_resource
 
-    # Mock ECS client
-    mock_ecs = MagicMock()
-    mock_get_client.return_value = mock_ecs
-
     result = terminate_resource(resource_id, mock_session)
 
     assert result.resource_type == "ecs_cluster"
@@ -778,14 +947,13 @@ def test_terminate_resource_ecs_cluster(mock_get_client):
     mock_ecs.delete_cluster.assert_called_once_with(cluster=external_id)
 
 
-@patch("packages.provisioner.localstack_adapter._get_boto3_client")
-def test_terminate_resource_ebs_volume(mock_get_client):
+def test_terminate_resource_ebs_volume(mock_ec2):
     """Test terminating an EBS volume."""
-    resource_id = str(uuid.uuid4())
+    resource_id = RESOURCE_ID
     external_id = "vol-12345"
 
     # Mock database session and resource
-    mock_session = MagicMock()
+    mock_session = Mock(spec=_SESSION_SPEC)
     mock_resource = MagicMock()
     mock_resource.id = resource_id
     mock_resource.resource_type = "ebs_volume"
@@ -793,10 +961,6 @@ def test_terminate_resource_ebs_volume(mock_get_client):
     mock_resource.status = "available"
     mock_session.query.return_value.filter_by.return_value.first.return_value = mock_resource
 
-    # Mock EC2 client
-    mock_ec2 = MagicMock()
-    mock_get_client.return_value = mock_ec2
-
     result = terminate_resource(resource_id, mock_session)
 
     assert result.resource_type == "ebs_volume"
@@ -806,27 +970,23 @@ def test_terminate_resource_ebs_volume(mock_get_client):
     mock_ec2.delete_volume.assert_called_once_with(VolumeId=external_id)
 
 
-@patch("packages.provisioner.localstack_adapter._get_boto3_client")
-def test_terminate_resource_vpc_resources(mock_get_client):
+def test_terminate_resource_vpc_resources(mock_ec2):
     """Test terminating VPC resources (security group, subnet, VPC)."""
     # Test security group
-    resource_id_sg = str(uuid.uuid4())
-    mock_session = MagicMock()
+    resource_id_sg = RESOURCE_IDS[0]
+    mock_session = Mock(spec=_SESSION_SPEC)
     mock_resource_sg = MagicMock()
     mock_resource_sg.id = resource_id_sg
     mock_resource_sg.resource_type = "security_group"
     mock_resource_sg.external_id = "sg-12345"
     mock_session.query.return_value.filter_by.return_value.first.return_value = mock_resource_sg
 
-    mock_ec2 = MagicMock()
-    mock_get_client.return_value = mock_ec2
-
     result = terminate_resource(resource_id_sg, mock_session)
     assert result.status == "terminated"
     mock_ec2.delete_security_group.assert_called_once_with(GroupId="sg-12345")
 
     # Test subnet
-    resource_id_subnet = str(uuid.uuid4())
+    resource_id_subnet = RESOURCE_IDS[1]
     mock_resource_subnet = MagicMock()
     mock_resource_subnet.id = resource_id_subnet
     mock_resource_subnet.resource_type = "subnet"
@@ -838,7 +998,7 @@ def test_terminate_resource_vpc_resources(mock_get_client):
     mock_ec2.delete_subnet.assert_called_with(SubnetId="subnet-12345")
 
     # Test VPC
-    resource_id_vpc = str(uuid.uuid4())
+    resource_id_vpc = RESOURCE_IDS[2]
     mock_resource_vpc = MagicMock()
     mock_resource_vpc.id = resource_id_vpc
     mock_resource_vpc.resource_type = "vpc"
@@ -852,24 +1012,23 @@ def test_terminate_resource_vpc_resources(mock_get_client):
 
 def test_terminate_resource_not_found():
     """Test terminating a resource that doesn't exist in database."""
-    resource_id = str(uuid.uuid4())
+    resource_id = RESOURCE_ID
 
     # Mock database session with no resource found
-    mock_session = MagicMock()
+    mock_session = Mock(spec=_SESSION_SPEC)
     mock_session.query.return_value.filter_by.return_value.first.return_value = None
 
     with pytest.raises(ValueError, match="Resource .* not found in database"):
         terminate_resource(resource_id, mock_session)
 
 
-@patch("packages.provisioner.localstack_adapter._get_boto3_client")
-def test_get_resource_status_ec2_instance(mock_get_client):
+def test_get_resource_status_ec2_instance(mock_ec2):
     """Test getting status of an EC2 instance."""
-    resource_id = str(uuid.uuid4())
+    resource_id = RESOURCE_ID
     external_id = "i-12345"
 
     # Mock database session and resource
-    mock_session = MagicMock()
+    mock_session = Mock(spec=_SESSION_SPEC)
     mock_resource = MagicMock()
     mock_resource.id = resource_id
     mock_resource.resource_type = "ec2_instance"
@@ -877,9 +1036,6 @@ def test_get_resource_status_ec2_instance(mock_get_client):
     mock_resource.status = "running"
     mock_session.query.return_value.filter_by.return_value.first.return_value = mock_resource
 
-    # Mock EC2 client
-    mock_ec2 = MagicMock()
-    mock_get_client.return_value = mock_ec2
     mock_ec2.describe_instances.return_value = {
         "Reservations": [
             {
@@ -910,14 +1066,13 @@ def test_get_resource_status_ec2_instance(mock_get_client):
     mock_ec2.describe_instances.assert_called_once_with(InstanceIds=[external_id])
 
 
-@patch("packages.provisioner.localstack_adapter._get_boto3_client")
-def test_get_resource_status_ecs_service(mock_get_client):
+def test_get_resource_status_ecs_service(mock_ecs):
     """Test getting status of an ECS service."""
-    resource_id = str(uuid.uuid4())
+    resource_id = RESOURCE_ID
     external_id = "arn:aws:ecs:us-east-1:123456789:service/my-cluster/my-service"
 
     # Mock database session and resource
-    mock_session = MagicMock()
+    mock_session = Mock(spec=_SESSION_SPEC)
     mock_resource = MagicMock()
     mock_resource.id = resource_id
     mock_resource.resource_type = "ecs_service"
@@ -925,9 +1080,6 @@ def test_get_resource_status_ecs_service(mock_get_client):
     mock_resource.status = "active"
     mock_session.query.return_value.filter_by.return_value.first.return_value = mock_resource
 
-    # Mock ECS client
-    mock_ecs = MagicMock()
-    mock_get_client.return_value = mock_ecs
     mock_ecs.describe_services.return_value = {
         "services": [
             {
@@ -949,14 +1101,13 @@ def test_get_resource_status_ecs_service(mock_get_client):
     assert result.details["running_count"] == "2"
 
 
-@patch("packages.provisioner.localstack_adapter._get_boto3_client")
-def test_get_resource_status_ecs_cluster(mock_get_client):
+def test_get_resource_status_ecs_cluster(mock_ecs):
     """Test getting status of an ECS cluster."""
-    resource_id = str(uuid.uuid4())
+    resource_id = RESOURCE_ID
     external_id = "arn:aws:ecs:us-east-1:123456789:cluster/my-cluster"
 
     # Mock database session and resource
-    mock_session = MagicMock()
+    mock_session = Mock(spec=_SESSION_SPEC)
     mock_resource = MagicMock()
     mock_resource.id = resource_id
     mock_resource.resource_type = "ecs_cluster"
@@ -964,9 +1115,6 @@ def test_get_resource_status_ecs_cluster(mock_get_client):
     mock_resource.status = "active"
     mock_session.query.return_value.filter_by.return_value.first.return_value = mock_resource
 
-    # Mock ECS client
-    mock_ecs = MagicMock()
-    mock_get_client.return_value = mock_ecs
     mock_ecs.describe_clusters.return_value = {
         "clusters": [
             {
@@ -985,14 +1133,13 @@ def test_get_resource_status_ecs_cluster(mock_get_client):
     assert result.details["active_services"] == "3"
 
 
-@patch("packages.provisioner.localstack_adapter._get_boto3_client")
-def test_get_resource_status_ebs_volume(mock_get_client):
+def test_get_resource_status_ebs_volume(mock_ec2):
     """Test getting status of an EBS volume."""
-    resource_id = str(uuid.uuid4())
+    resource_id = RESOURCE_ID
     external_id = "vol-12345"
 
     # Mock database session and resource
-    mock_session = MagicMock()
+    mock_session = Mock(spec=_SESSION_SPEC)
     mock_resource = MagicMock()
     mock_resource.id = resource_id
     mock_resource.resource_type = "ebs_volume"
@@ -1000,9 +1147,6 @@ def test_get_resource_status_ebs_volume(mock_get_client):
     mock_resource.status = "available"
     mock_session.query.return_value.filter_by.return_value.first.return_value = mock_resource
 
-    # Mock EC2 client
-    mock_ec2 = MagicMock()
-    mock_get_client.return_value = mock_ec2
     mock_ec2.describe_volumes.return_value = {
         "Volumes": [
             {
@@ -1023,12 +1167,11 @@ def test_get_resource_status_ebs_volume(mock_get_client):
     assert result.details["volume_type"] == "gp3"
 
 
-@patch("packages.provisioner.localstack_adapter._get_boto3_client")
-def test_get_resource_status_vpc_resources(mock_get_client):
+def test_get_resource_status_vpc_resources(mock_ec2):
     """Test getting status of VPC resources."""
     # Test VPC
-    resource_id_vpc = str(uuid.uuid4())
-    mock_session = MagicMock()
+    resource_id_vpc = RESOURCE_IDS[2]
+    mock_session = Mock(spec=_SESSION_SPEC)
     mock_resource_vpc = MagicMock()
     mock_resource_vpc.id = resource_id_vpc
     mock_resource_vpc.resource_type = "vpc"
@@ -1036,8 +1179,6 @@ def test_get_resource_status_vpc_resources(mock_get_client):
     mock_resource_vpc.status = "available"
     mock_session.query.return_value.filter_by.return_value.first.return_value = mock_resource_vpc
 
-    mock_ec2 = MagicMock()
-    mock_get_client.return_value = mock_ec2
     mock_ec2.describe_vpcs.return_value = {
         "Vpcs": [
             {
@@ -1053,7 +1194,7 @@ def test_get_resource_status_vpc_resources(mock_get_client):
     assert result.details["cidr_block"] == "10.0.0.0/16"
 
     # Test subnet
-    resource_id_subnet = str(uuid.uuid4())
+    resource_id_subnet = RESOURCE_IDS[1]
     mock_resource_subnet = MagicMock()
     mock_resource_subnet.id = resource_id_subnet
     mock_resource_subnet.resource_type = "subnet"
@@ -1076,7 +1217,7 @@ def test_get_resource_status_vpc_resources(mock_get_client):
     assert result.details["cidr_block"] == "10.0.1.0/24"
 
     # Test security group
-    resource_id_sg = str(uuid.uuid4())
+    resource_id_sg = RESOURCE_IDS[0]
     mock_resource_sg = MagicMock()
     mock_resource_sg.id = resource_id_sg
     mock_resource_sg.resource_type = "security_group"
@@ -1099,14 +1240,13 @@ def test_get_resource_status_vpc_resources(mock_get_client):
     assert result.details["group_name"] == "my-sg"
 
 
-@patch("packages.provisioner.localstack_adapter._get_boto3_client")
-def test_get_resource_status_updates_database(mock_get_client):
+def test_get_resource_status_updates_database(mock_ec2):
     """Test that get_resource_status updates database when status changes."""
-    resource_id = str(uuid.uuid4())
+    resource_id = RESOURCE_ID
     external_id = "i-12345"
 
     # Mock database session and resource with old status
-    mock_session = MagicMock()
+    mock_session = Mock(spec=_SESSION_SPEC)
     mock_resource = MagicMock()
     mock_resource.id = resource_id
     mock_resource.resource_type = "ec2_instance"
@@ -1114,9 +1254,6 @@ def test_get_resource_status_updates_database(mock_get_client):
     mock_resource.status = "pending"  # Old status
     mock_session.query.return_value.filter_by.return_value.first.return_value = mock_resource
 
-    # Mock EC2 client with new status
-    mock_ec2 = MagicMock()
-    mock_get_client.return_value = mock_ec2
     mock_ec2.describe_instances.return_value = {
         "Reservations": [
             {
@@ -1139,14 +1276,13 @@ def test_get_resource_status_updates_database(mock_get_client):
     mock_session.commit.assert_called_once()
 
 
-@patch("packages.provisioner.localstack_adapter._get_boto3_client")
-def test_get_resource_status_resource_not_found_in_aws(mock_get_client):
+def test_get_resource_status_resource_not_found_in_aws(mock_ec2):
     """Test getting status when resource doesn't exist in AWS."""
-    resource_id = str(uuid.uuid4())
+    resource_id = RESOURCE_ID
     external_id = "i-12345"
 
     # Mock database session and resource
-    mock_session = MagicMock()
+    mock_session = Mock(spec=_SESSION_SPEC)
     mock_resource = MagicMock()
     mock_resource.id = resource_id
     mock_resource.resource_type = "ec2_instance"
@@ -1154,9 +1290,6 @@ def test_get_resource_status_resource_not_found_in_aws(mock_get_client):
     mock_resource.status = "running"
     mock_session.query.return_value.filter_by.return_value.first.return_value = mock_resource
 
-    # Mock EC2 client with empty response
-    mock_ec2 = MagicMock()
-    mock_get_client.return_value = mock_ec2
     mock_ec2.describe_instances.return_value = {"Reservations": []}
 
     result = get_resource_status(resource_id, mock_session)
@@ -1167,32 +1300,28 @@ def test_get_resource_status_resource_not_found_in_aws(mock_get_client):
 
 def test_get_resource_status_not_found_in_database():
     """Test getting status of a resource that doesn't exist in database."""
-    resource_id = str(uuid.uuid4())
+    resource_id = RESOURCE_ID
 
     # Mock database session with no resource found
-    mock_session = MagicMock()
+    mock_session = Mock(spec=_SESSION_SPEC)
     mock_session.query.return_value.filter_by.return_value.first.return_value = None
 
     with pytest.raises(ValueError, match="Resource .* not found in database"):
         get_resource_status(resource_id, mock_session)
 
 
-@patch("packages.provisioner.localstack_adapter._get_boto3_client")
-def test_get_resource_status_api_failure(mock_get_client):
+def test_get_resource_status_api_failure(mock_ec2):
     """Test getting status when AWS API fails."""
-    resource_id = str(uuid.uuid4())
+    resource_id = RESOURCE_ID
 
     # Mock database session and resource
-    mock_session = MagicMock()
+    mock_session = Mock(spec=_SESSION_SPEC)
     mock_resource = MagicMock()
     mock_resource.id = resource_id
     mock_resource.resource_type = "ec2_instance"
     mock_resource.external_id = "i-12345"
     mock_session.query.return_value.filter_by.return_value.first.return_value = mock_resource
 
-    # Mock EC2 client to raise exception
-    mock_ec2 = MagicMock()
-    mock_get_client.return_value = mock_ec2
     mock_ec2.describe_instances.side_effect = Exception("API error")
 
     with pytest.raises(RuntimeError, match="Failed to get resource status"):
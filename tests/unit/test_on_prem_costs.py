@@ -2,8 +2,6 @@
 
 from decimal import Decimal
 
-import pytest
-
 from packages.tco_engine import on_prem_costs
 
 
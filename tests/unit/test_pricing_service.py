@@ -1,9 +1,8 @@
 """Unit tests for pricing service."""
 
-import json
 from datetime import datetime, timedelta
 from decimal import Decimal
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, patch
 from uuid import uuid4
 
 import pytest
@@ -1,6 +1,5 @@
 """Unit tests for provisioning API endpoints."""
 
-import json
 import uuid
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
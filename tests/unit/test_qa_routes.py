@@ -1,7 +1,6 @@
 """Unit tests for Q&A web UI routes."""
 
 import pytest
-from flask import session
 
 from packages.web_ui.app import create_app
 
@@ -58,7 +58,6 @@ def mock_terraform_state(provision_id):
     return state
 
 
-@pytest.mark.asyncio
 async def test_rollback_provisioning_success(
     mock_db_session, provision_id, mock_provision, mock_terraform_state
 ):
@@ -95,7 +94,6 @@ async def test_rollback_provisioning_success(
     mock_db_session.commit.assert_called()
 
 
-@pytest.mark.asyncio
 async def test_rollback_provisioning_no_provision_record(mock_db_session, provision_id):
     """Test rollback when provision record is not found."""
     # Setup database mock to return None
@@ -109,7 +107,6 @@ async def test_rollback_provisioning_no_provision_record(mock_db_session, provis
     assert "Provision record not found" in result.error
 
 
-@pytest.mark.asyncio
 async def test_rollback_provisioning_no_terraform_state(
     mock_db_session, provision_id, mock_provision
 ):
@@ -131,7 +128,6 @@ async def test_rollback_provisioning_no_terraform_state(
     mock_db_session.commit.assert_called()
 
 
-@pytest.mark.asyncio
 async def test_rollback_provisioning_terraform_destroy_failure(
     mock_db_session, provision_id, mock_provision, mock_terraform_state
 ):
@@ -157,7 +153,6 @@ async def test_rollback_provisioning_terraform_destroy_failure(
     assert "Destroy command failed" in result.error
 
 
-@pytest.mark.asyncio
 async def test_rollback_provisioning_updates_resource_status(
     mock_db_session, provision_id, mock_provision, mock_terraform_state
 ):
@@ -194,7 +189,6 @@ async def test_rollback_provisioning_updates_resource_status(
     )
 
 
-@pytest.mark.asyncio
 async def test_rollback_deployment_success(
     mock_db_session, deployment_id, provision_id, mock_provision, mock_terraform_state
 ):
@@ -231,7 +225,6 @@ async def test_rollback_deployment_success(
     assert result.resources_removed == 2
 
 
-@pytest.mark.asyncio
 async def test_rollback_deployment_no_provision_record(
     mock_db_session, deployment_id, provision_id
 ):
@@ -247,7 +240,6 @@ async def test_rollback_deployment_no_provision_record(
     assert "Provision record not found" in result.error
 
 
-@pytest.mark.asyncio
 async def test_rollback_deployment_provisioning_rollback_failure(
     mock_db_session, deployment_id, provision_id, mock_provision, mock_terraform_state
 ):
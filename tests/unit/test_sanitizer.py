@@ -1,7 +1,5 @@
 """Unit tests for input sanitization and validation."""
 
-import pytest
-
 from packages.security import sanitizer
 
 
@@ -2,9 +2,8 @@
 
 import asyncio
 import time
-from datetime import datetime
 from decimal import Decimal
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 
 import pytest
 
@@ -12,7 +12,7 @@ from packages.api.app import create_app
 from packages.database import create_tables, get_session, init_database
 from packages.database.models import ConfigurationModel, TCOResultModel
 from packages.security import auth
-from packages.tco_engine.calculator import AWSPricing, CostBreakdown, CostLineItem
+from packages.tco_engine.calculator import CostBreakdown, CostLineItem
 
 
 @pytest.fixture(scope="module")
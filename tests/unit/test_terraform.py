@@ -2,8 +2,6 @@
 
 import json
 import uuid
-from datetime import datetime
-from pathlib import Path
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
@@ -90,7 +88,6 @@ def test_generate_terraform_invalid_cloud_path(mock_config):
         generate_terraform(mock_config, "invalid_path")
 
 
-@pytest.mark.asyncio
 async def test_apply_terraform_success(mock_config, tmp_path):
     """Test successful Terraform apply operation."""
     provision_id = str(uuid.uuid4())
@@ -135,7 +132,6 @@ async def test_apply_terraform_success(mock_config, tmp_path):
     mock_session.commit.assert_called_once()
 
 
-@pytest.mark.asyncio
 async def test_apply_terraform_init_failure(mock_config, tmp_path):
     """Test Terraform apply when init fails."""
     provision_id = str(uuid.uuid4())
@@ -158,7 +154,6 @@ async def test_apply_terraform_init_failure(mock_config, tmp_path):
     assert result.state_file is None
 
 
-@pytest.mark.asyncio
 async def test_apply_terraform_apply_failure(mock_config, tmp_path):
     """Test Terraform apply when apply fails."""
     provision_id = str(uuid.uuid4())
@@ -181,7 +176,6 @@ async def test_apply_terraform_apply_failure(mock_config, tmp_path):
     assert "Terraform apply failed" in result.error
 
 
-@pytest.mark.asyncio
 async def test_destroy_terraform_success(tmp_path):
     """Test successful Terraform destroy operation."""
     provision_id = str(uuid.uuid4())
@@ -218,7 +212,6 @@ async def test_destroy_terraform_success(tmp_path):
     assert (tmp_path / "terraform.tfstate").exists()
 
 
-@pytest.mark.asyncio
 async def test_destroy_terraform_state_not_found():
     """Test Terraform destroy when state is not found in database."""
     provision_id = str(uuid.uuid4())
@@ -233,7 +226,6 @@ async def test_destroy_terraform_state_not_found():
     assert "Terraform state not found" in result.error
 
 
-@pytest.mark.asyncio
 async def test_destroy_terraform_destroy_failure(tmp_path):
     """Test Terraform destroy when destroy command fails."""
     provision_id = str(uuid.uuid4())